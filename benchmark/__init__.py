@@ -0,0 +1,4 @@
+from .generators import GENERATORS
+
+
+__all__ = ['GENERATORS']
@@ -0,0 +1,209 @@
+from random import Random
+from typing import Callable, Dict, Iterator, List, Union
+
+from day13.serious import compare
+
+import string
+
+
+LETTERS = string.ascii_lowercase + string.ascii_uppercase
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23]
+DIVIDER_PACKETS = [[[2]], [[6]]]
+
+
+def day01(size: int, rng: Random) -> List[str]:
+    """size elves carrying 1 to 15 snacks each"""
+    lines: List[str] = []
+    for _ in range(size):
+        lines.extend(str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 15)))
+        lines.append('')
+    return lines
+
+
+def day02(size: int, rng: Random) -> List[str]:
+    """size rounds"""
+    return [f'{rng.choice("ABC")} {rng.choice("XYZ")}' for _ in range(size)]
+
+
+def _rucksack(letters: str, badge: str, rng: Random) -> str:
+    shared, *rest = rng.sample(letters, len(letters))
+    fi_letters, se_letters = rest[:len(rest)//2], rest[len(rest)//2:]
+    half_size = rng.randint(4, 16)
+    fi_half = [shared, badge] + rng.choices(fi_letters, k=half_size - 1)
+    se_half = [shared] + rng.choices(se_letters, k=half_size)
+    rng.shuffle(fi_half)
+    rng.shuffle(se_half)
+    return ''.join(fi_half + se_half)
+
+
+def day03(size: int, rng: Random) -> List[str]:
+    """size groups of three rucksacks. The halves of each sack share one item, each group shares one badge."""
+    lines: List[str] = []
+    for _ in range(size):
+        badge, *rest = rng.sample(LETTERS, len(LETTERS))
+        third = len(rest) // 3
+        lines.extend(_rucksack(''.join(rest[i * third:(i + 1) * third]), badge, rng) for i in range(3))
+    return lines
+
+
+def _section_range(rng: Random) -> str:
+    start = rng.randint(1, 99)
+    return f'{start}-{rng.randint(start, 99)}'
+
+
+def day04(size: int, rng: Random) -> List[str]:
+    """size pairs of section assignments"""
+    return [f'{_section_range(rng)},{_section_range(rng)}' for _ in range(size)]
+
+
+def day05(size: int, rng: Random, num_stacks: int = 9) -> List[str]:
+    """size crane moves over num_stacks stacks"""
+    stacks = [rng.choices(string.ascii_uppercase, k=rng.randint(1, 8)) for _ in range(num_stacks)]
+    height = max(len(stack) for stack in stacks)
+    lines = [
+        ' '.join(f'[{stack[level]}]' if level < len(stack) else '   ' for stack in stacks)
+        for level in reversed(range(height))]
+    lines.append(' '.join(f' {i} ' for i in range(1, num_stacks + 1)))
+    lines.append('')
+
+    sizes = [len(stack) for stack in stacks]
+    for _ in range(size):
+        src = rng.choice([i for i, stack_size in enumerate(sizes) if stack_size])
+        dst = rng.choice([i for i in range(num_stacks) if i != src])
+        amount = rng.randint(1, sizes[src])
+        sizes[src] -= amount
+        sizes[dst] += amount
+        lines.append(f'move {amount} from {src + 1} to {dst + 1}')
+    return lines
+
+
+def day06(size: int, rng: Random) -> List[str]:
+    """a datastream of size characters whose only start-of-packet and start-of-message markers are at the end"""
+    filler = ''.join(rng.choices('abc', k=max(size - 14, 0)))
+    return [filler + ''.join(rng.sample(string.ascii_lowercase[3:], 14))]
+
+
+def _sizes_adding_up_to(total: int, weights: List[int]) -> List[int]:
+    """Positive sizes in proportion to weights, summing to exactly total."""
+    spare, sizes = total - len(weights), []
+    running_weight, handed_out, weight_sum = 0, 0, sum(weights)
+    for weight in weights:
+        running_weight += weight
+        share = spare * running_weight // weight_sum
+        sizes.append(1 + share - handed_out)
+        handed_out = share
+    return sizes
+
+
+def day07(size: int, rng: Random) -> List[str]:
+    """a terminal session exploring a random tree of size directories, using 40M to 70M of the 70M disk so
+    that part 2 has something to free up"""
+    children: List[List[int]] = [[] for _ in range(size)]
+    for node in range(1, size):
+        children[rng.randrange(node)].append(node)
+
+    num_files = [rng.randint(0, 5) for _ in range(size)]
+    num_files[0] = max(num_files[0], 1)
+    file_sizes = iter(_sizes_adding_up_to(
+        rng.randint(40_000_001, 69_999_999), [rng.randint(1000, 300000) for _ in range(sum(num_files))]))
+
+    lines = ['$ cd /']
+
+    def list_directory(node: int) -> Iterator[int]:
+        lines.append('$ ls')
+        lines.extend(f'dir d{child}' for child in children[node])
+        lines.extend(
+            f'{next(file_sizes)} f{i}.{rng.choice(["txt", "dat", "log"])}'
+            for i in range(num_files[node]))
+        return iter(children[node])
+
+    unvisited = [list_directory(0)]
+    while unvisited:
+        child = next(unvisited[-1], None)
+        if child is None:
+            unvisited.pop()
+            if unvisited:
+                lines.append('$ cd ..')
+        else:
+            lines.append(f'$ cd d{child}')
+            unvisited.append(list_directory(child))
+    return lines
+
+
+def day08(size: int, rng: Random) -> List[str]:
+    """a size x size forest"""
+    return [''.join(rng.choices(string.digits, k=size)) for _ in range(size)]
+
+
+def day09(size: int, rng: Random) -> List[str]:
+    """size rope moves"""
+    return [f'{rng.choice("LURD")} {rng.randint(1, 20)}' for _ in range(size)]
+
+
+def day10(size: int, rng: Random) -> List[str]:
+    """size instructions"""
+    return [rng.choice(['noop', f'addx {rng.randint(-20, 20)}']) for _ in range(size)]
+
+
+def day11(size: int, rng: Random, items_per_monkey: int = 4) -> List[str]:
+    """size monkeys holding items_per_monkey items each. No 'old * old', it would blow up part 1."""
+    if size < 2:
+        raise SystemError('monkeys need at least one other monkey to throw to')
+
+    lines: List[str] = []
+    for monka_id in range(size):
+        items = ', '.join(str(rng.randint(50, 100)) for _ in range(items_per_monkey))
+        operation = rng.choice([f'old * {rng.randint(2, 19)}', f'old + {rng.randint(1, 8)}'])
+        pass_id, fail_id = rng.sample([i for i in range(size) if i != monka_id] * 2, 2)
+        lines.extend([
+            f'Monkey {monka_id}:',
+            f'  Starting items: {items}',
+            f'  Operation: new = {operation}',
+            f'  Test: divisible by {rng.choice(PRIMES)}',
+            f'    If true: throw to monkey {pass_id}',
+            f'    If false: throw to monkey {fail_id}',
+            ''])
+    return lines[:-1]
+
+
+def day12(size: int, rng: Random) -> List[str]:
+    """a size x size height map with a climbable path along the top row and the right column"""
+    if size < 14:
+        raise SystemError('need at least 14x14 to climb from a to z one step at a time')
+
+    grid = [rng.choices(string.ascii_lowercase, k=size) for _ in range(size)]
+    path = [(0, j) for j in range(size)] + [(i, size - 1) for i in range(1, size)]
+    for step, (i, j) in enumerate(path):
+        grid[i][j] = string.ascii_lowercase[min(step * 25 // (len(path) - 1), 25)]
+    grid[0][0], grid[size - 1][size - 1] = 'S', 'E'
+    return [''.join(row) for row in grid]
+
+
+def _packet(rng: Random, depth: int) -> Union[int, list]:
+    if depth == 0 or rng.random() < 0.4:
+        return rng.randint(0, 10)
+    return [_packet(rng, depth - 1) for _ in range(rng.randint(0, 5))]
+
+
+def _top_level_packet(rng: Random) -> list:
+    """Never ties with a divider packet, part 2 can not tell them apart otherwise."""
+    while True:
+        packet = [_packet(rng, 4) for _ in range(rng.randint(0, 5))]
+        if all(compare(packet, divider) != 0 for divider in DIVIDER_PACKETS):
+            return packet
+
+
+def day13(size: int, rng: Random) -> List[str]:
+    """size pairs of packets"""
+    lines: List[str] = []
+    for _ in range(size):
+        for _ in range(2):
+            lines.append(str(_top_level_packet(rng)).replace(' ', ''))
+        lines.append('')
+    return lines[:-1]
+
+
+GENERATORS: Dict[int, Callable[[int, Random], List[str]]] = {
+    1: day01, 2: day02, 3: day03, 4: day04, 5: day05, 6: day06, 7: day07,
+    8: day08, 9: day09, 10: day10, 11: day11, 12: day12, 13: day13,
+}
@@ -0,0 +1,94 @@
+from dataclasses import asdict
+from pathlib import Path
+from random import Random
+from typing import Dict, List, Optional
+
+from benchmark.generators import GENERATORS
+from utils.run import REPO_ROOT, PartResult, format_text, parse_int_ranges, run
+
+import argparse
+import datetime
+import json
+import subprocess
+import tempfile
+
+
+DEFAULT_HISTORY = REPO_ROOT / 'benchmark' / 'history.json'
+
+
+def generate_inputs(directory: Path, days: List[int], sizes: Dict[int, int], seed: int) -> None:
+    """Writes directory/dayNN/input.txt for each day."""
+    for day in days:
+        lines = GENERATORS[day](sizes[day], Random(seed + day))
+        day_dir = directory / f'day{day:02}'
+        day_dir.mkdir(parents=True, exist_ok=True)
+        (day_dir / 'input.txt').write_text('\n'.join(lines))
+
+
+def current_commit() -> str:
+    completed = subprocess.run(
+        ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True)
+    return completed.stdout.strip() or 'unknown'
+
+
+def append_to_history(history_path: Path, entry: Dict) -> None:
+    history = json.loads(history_path.read_text()) if history_path.exists() else []
+    history.append(entry)
+    history_path.write_text(json.dumps(history, indent=2))
+
+
+def parse_sizes(description: str, days: List[int], default_size: int) -> Dict[int, int]:
+    """'8=300,11=20' overrides the default size of days 8 and 11"""
+    sizes = {day: default_size for day in days}
+    for item in filter(None, description.split(',')):
+        day, size = item.split('=')
+        sizes[int(day)] = int(size)
+    return sizes
+
+
+def benchmark(
+        days: List[int], parts: List[int], sizes: Dict[int, int], seed: int,
+        input_dir: Optional[str] = None, jobs: int = 1) -> List[PartResult]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = Path(input_dir or tmp_dir)
+        generate_inputs(directory, days, sizes, seed)
+        return run(days, parts, str(directory / 'day{day}' / 'input.txt'), jobs)
+
+
+def get_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Time every part against generated inputs.')
+    parser.add_argument('--days', default='1-13', help="days to run, e.g. '1-13' or '1,3,5-7'")
+    parser.add_argument('--parts', default='1,2', help="parts to run, e.g. '1,2'")
+    parser.add_argument('--size', type=int, default=1000, help='size passed to every generator')
+    parser.add_argument('--sizes', default='', help="per day overrides of --size, e.g. '8=300,11=20'")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--input-dir', help='keep the generated inputs here instead of a temporary directory')
+    parser.add_argument(
+        '--jobs', type=int, default=1,
+        help='worker processes; more than 1 is faster but parts then compete for the CPU and memory bandwidth')
+    parser.add_argument('--history', type=Path, default=DEFAULT_HISTORY, help='JSON file the run is appended to')
+    parser.add_argument('--no-history', action='store_true', help='only print the results')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = get_arg_parser().parse_args(argv)
+    days, parts = parse_int_ranges(args.days), parse_int_ranges(args.parts)
+    sizes = parse_sizes(args.sizes, days, args.size)
+
+    results = benchmark(days, parts, sizes, args.seed, args.input_dir, args.jobs)
+    print(format_text(results))
+
+    if not args.no_history:
+        append_to_history(args.history, {
+            'commit': current_commit(),
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'seed': args.seed,
+            'jobs': args.jobs,
+            'sizes': sizes,
+            'results': [asdict(result) for result in results],
+        })
+
+
+if __name__ == '__main__':
+    main()
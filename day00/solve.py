@@ -11,6 +11,7 @@ def part_2(lines: List[str]) -> None:
     pass
 
 
-lines = read_file('day00/input.txt')
-print('part1', part_1(lines))  # type: ignore
-print('part2', part_2(lines))  # type: ignore
+if __name__ == '__main__':
+    lines = read_file('day00/input.txt')
+    print('part1', part_1(lines))  # type: ignore
+    print('part2', part_2(lines))  # type: ignore
@@ -1,32 +1,51 @@
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, groupby
+from typing import Iterable, Iterator, List
 
-from utils import read_file
+from utils import iter_lines, read_file
 
+import heapq
 
-def create_elf_calories(input_lines: List[str]) -> List[int]:
-    elf_calories: List[int] = []
 
-    sum_for_elf = 0
-    for line in input_lines:
-        if line == '':
-            elf_calories.append(sum_for_elf)
-            sum_for_elf = 0
-        else:
-            sum_for_elf += int(line)
+def iter_elf_calories(input_lines: Iterable[str]) -> Iterator[int]:
+    """Elves are the runs of non-blank lines, the last one needs no blank line after it."""
+    for is_elf, snacks in groupby(input_lines, bool):
+        if is_elf:
+            yield sum(int(snack) for snack in snacks)
 
-    return elf_calories
 
+def create_elf_calories(input_lines: Iterable[str]) -> List[int]:
+    return list(iter_elf_calories(input_lines))
 
-def part_1(lines: List[str]) -> int:
-    elf_calories = create_elf_calories(lines)
-    return max(elf_calories)
 
+def top_k_calories(input_lines: Iterable[str], k: int) -> List[int]:
+    """Largest k totals, descending. Only k totals are kept in memory at any time."""
+    return heapq.nlargest(k, iter_elf_calories(input_lines))
 
-def part_2(lines: List[str]) -> int:
-    elf_calories = create_elf_calories(lines)
-    return sum(sorted(elf_calories, reverse=True)[0:3])
 
+def top_k_calories_of_file(file_name: str, k: int) -> List[int]:
+    return top_k_calories(iter_lines(file_name), k)
 
-lines = read_file('day01/input.txt')
-print('part1', part_1(lines))  # type: ignore
-print('part2', part_2(lines))  # type: ignore
+
+def top_k_calories_of_shards(file_names: List[str], k: int, jobs: int = 1) -> List[int]:
+    """Shards are files of whole elves; an elf's snacks must not be split across two shards."""
+    if jobs == 1:
+        per_shard = [top_k_calories_of_file(file_name, k) for file_name in file_names]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            per_shard = list(executor.map(top_k_calories_of_file, file_names, [k] * len(file_names)))
+    return heapq.nlargest(k, chain.from_iterable(per_shard))
+
+
+def part_1(lines: Iterable[str]) -> int:
+    return top_k_calories(lines, 1)[0]
+
+
+def part_2(lines: Iterable[str]) -> int:
+    return sum(top_k_calories(lines, 3))
+
+
+if __name__ == '__main__':
+    lines = read_file('day01/input.txt')
+    print('part1', part_1(lines))  # type: ignore
+    print('part2', part_2(lines))  # type: ignore
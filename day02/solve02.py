@@ -1,7 +1,8 @@
+from collections import Counter
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, Iterable, Optional
 
-from utils import read_file
+from utils import iter_byte_blocks, read_file
 
 
 @dataclass
@@ -50,34 +51,84 @@ def eval_right_against_left(left: Move, right: Move) -> int:
     raise SystemError('shoudlnt happen')
 
 
-def part_1(rounds: List[str]) -> int:
-    total_score = 0
-    for game_round in rounds:
-        left_nazo, right_nazo = game_round.split(' ')
-        total_score += eval_right_against_left(CODE_TO_MOVE[left_nazo], CODE_TO_MOVE[right_nazo])
-    return total_score
-
-
-def part_2(rounds: List[str]) -> int:
-    total_score = 0
-    for game_round in rounds:
-        left_nazo, right_nazo = game_round.split(' ')
-        left_move = CODE_TO_MOVE[left_nazo]
-        right_move = None
-        if right_nazo == 'X':
-            right_move = left_move.wins_against
-        elif right_nazo == 'Y':
-            right_move = left_move
-        elif right_nazo == 'Z':
-            right_move = left_move.loses_to
-        else:
-            raise SystemError('shouldnt happen')
-
-        total_score += eval_right_against_left(left_move, right_move)
-    return total_score
+def choose_move_for_outcome(left_move: Move, outcome_nazo: str) -> Move:
+    if outcome_nazo == 'X':
+        return left_move.wins_against
+    if outcome_nazo == 'Y':
+        return left_move
+    if outcome_nazo == 'Z':
+        return left_move.loses_to
+    raise SystemError('shouldnt happen')
 
 
 init_moves()
-lines = read_file('day02/input.txt')
-print('part1', part_1(lines))
-print('part2', part_2(lines))
+
+# There are only 9 different rounds, so both strategies boil down to a score per round
+ROUND_CODES = [f'{left_nazo} {right_nazo}' for left_nazo in 'ABC' for right_nazo in 'XYZ']
+SCORES_PART_1 = {
+    code: eval_right_against_left(CODE_TO_MOVE[code[0]], CODE_TO_MOVE[code[2]])
+    for code in ROUND_CODES}
+SCORES_PART_2 = {
+    code: eval_right_against_left(CODE_TO_MOVE[code[0]], choose_move_for_outcome(CODE_TO_MOVE[code[0]], code[2]))
+    for code in ROUND_CODES}
+
+
+def count_rounds(rounds: Iterable[str]) -> Dict[str, int]:
+    return Counter(rounds)
+
+
+def count_three_byte_lines(block: bytes) -> Optional[int]:
+    """How many lines the block has if every one of them is 3 bytes long and they all end in the same
+    LF or CRLF, the last one possibly in none. None otherwise."""
+    line_ending = b'\r\n' if block[3:5] == b'\r\n' else b'\n'
+    stride = 3 + len(line_ending)
+    num_lines = (len(block) + len(line_ending)) // stride
+    if len(block) not in (num_lines * stride, num_lines * stride - len(line_ending)):
+        return None
+    for k, ending_byte in enumerate(line_ending):
+        endings = block[3 + k::stride]
+        if endings.count(ending_byte) != len(endings):
+            return None
+    return num_lines
+
+
+def count_rounds_in_file(file_name: str) -> Dict[str, int]:
+    """Counts every round code in newline aligned blocks of the file, without splitting it into lines.
+    A code can not straddle two blocks, since both of its letters sit on the same line. A block that is not
+    exactly one code per 3 byte line is counted line by line instead, naming the lines that are not a round."""
+    encoded_codes = [(code, code.encode()) for code in ROUND_CODES]
+    counts = dict.fromkeys(ROUND_CODES, 0)
+    for block in iter_byte_blocks(file_name):
+        if (num_lines := count_three_byte_lines(block)) is not None:
+            block_counts = [(code, block.count(encoded_code)) for code, encoded_code in encoded_codes]
+            if sum(found for _, found in block_counts) == num_lines:
+                for code, found in block_counts:
+                    counts[code] += found
+                continue
+
+        lines = block.decode().splitlines()
+        if unknown_rounds := [line for line in lines if line not in SCORES_PART_1]:
+            raise SystemError(f'shouldnt happen: {unknown_rounds[:10]}')
+        for code, found in Counter(lines).items():
+            counts[code] += found
+    return counts
+
+
+def total_score(round_counts: Dict[str, int], scores: Dict[str, int]) -> int:
+    if unknown_rounds := set(round_counts) - set(scores):
+        raise SystemError(f'shouldnt happen: {unknown_rounds}')
+    return sum(count * scores[code] for code, count in round_counts.items())
+
+
+def part_1(rounds: Iterable[str]) -> int:
+    return total_score(count_rounds(rounds), SCORES_PART_1)
+
+
+def part_2(rounds: Iterable[str]) -> int:
+    return total_score(count_rounds(rounds), SCORES_PART_2)
+
+
+if __name__ == '__main__':
+    lines = read_file('day02/input.txt')
+    print('part1', part_1(lines))
+    print('part2', part_2(lines))
@@ -1,6 +1,8 @@
-from typing import List
+from typing import Iterable, List, Sequence, Set, Tuple
 
-from utils import divide_into_chunks, read_file
+from utils import iter_byte_lines, read_file, stride_records
+
+import string
 
 
 def priority_of(char: str) -> int:
@@ -13,16 +15,16 @@ def find_priority_item_in_sack(sack: str) -> str:
     mid_point = len(sack)//2
     fi_half, se_half = sack[:mid_point], sack[mid_point:]
 
-    intersection = set(fi_half).intersection(set(se_half))
+    intersection = set(fi_half).intersection(se_half)
     if len(intersection) != 1:
         print(sack, fi_half, se_half, intersection, sep='\n')
         raise SystemError('Weird intersection for sets?')
     return intersection.pop()
 
 
-def find_priority_item_in_group(sack: List[str]) -> str:
+def find_priority_item_in_group(sack: Sequence[str]) -> str:
     fi, se, th, = sack
-    intersection = set.intersection(set(fi), set(se), set(th))
+    intersection = set(fi).intersection(se, th)
     if len(intersection) != 1:
         print(sack, fi, se, th, intersection, sep='\n')
         raise SystemError('Weird intersection for sets?')
@@ -30,19 +32,52 @@ def find_priority_item_in_group(sack: List[str]) -> str:
     return intersection.pop()
 
 
-def part_one(rucksacks: List[str]) -> int:
+# Works on undecoded sacks, where items are byte values
+PRIORITIES = {ord(char): priority_of(char) for char in string.ascii_letters}
+
+
+def the_only_item(items: Set[int]) -> int:
+    if len(items) != 1:
+        raise SystemError(f'Weird intersection for sets? {items}')
+    return items.pop()
+
+
+def priority_sums(rucksacks: Iterable[bytes]) -> Tuple[int, int]:
+    """Answers of both parts in a single pass over the sacks"""
+    sack_priorities = group_priorities = 0
+    group: List[bytes] = []
+    for sack in rucksacks:
+        mid_point = len(sack)//2
+        sack_priorities += PRIORITIES[the_only_item(set(sack[:mid_point]).intersection(sack[mid_point:]))]
+
+        group.append(sack)
+        if len(group) == 3:
+            fi, se, th = group
+            group_priorities += PRIORITIES[the_only_item(set(fi).intersection(se, th))]
+            group.clear()
+
+    if group:
+        raise SystemError(f'{len(group)} sacks left over, not a group of 3')
+    return sack_priorities, group_priorities
+
+
+def priority_sums_of_file(file_name: str) -> Tuple[int, int]:
+    return priority_sums(iter_byte_lines(file_name))
+
+
+def part_1(rucksacks: List[str]) -> int:
     priority_items = [find_priority_item_in_sack(sack) for sack in rucksacks]
     priorities = [priority_of(item) for item in priority_items]
     return sum(priorities)
 
 
-def part_two(rucksacks: List[str]) -> int:
-    chunks = divide_into_chunks(rucksacks, 3)
-    priority_items = [find_priority_item_in_group(chunk) for chunk in chunks]
+def part_2(rucksacks: List[str]) -> int:
+    priority_items = [find_priority_item_in_group(group) for group in stride_records(rucksacks, 3)]
     priorities = [priority_of(item) for item in priority_items]
     return sum(priorities)
 
 
-lines = read_file('day03/input.txt')
-print('part1', part_one(lines))
-print('part2', part_two(lines))
+if __name__ == '__main__':
+    lines = read_file('day03/input.txt')
+    print('part1', part_1(lines))
+    print('part2', part_2(lines))
@@ -1,8 +1,12 @@
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 
 
-from utils import read_file
+from utils import iter_byte_blocks, read_file
+
+import operator
 
 
 @dataclass
@@ -13,9 +17,8 @@ class Range:
     def contains(self, other: 'Range') -> bool:
         return self.start <= other.start and other.end <= self.end
 
-    def overlaps_with(self, other: 'Range') -> int:
-        sml, big = sorted([self, other], key=lambda x: x.start)
-        return big.start <= sml.end
+    def overlaps_with(self, other: 'Range') -> bool:
+        return self.start <= other.end and other.start <= self.end
 
     def __post_init__(self) -> None:
         if self.start > self.end:
@@ -34,7 +37,144 @@ def create_ranges(line: str) -> Tuple[Range, Range]:
         Range(*get_ends(right)))
 
 
-def part_1(lines: List[str]) -> int:
+class RangeIndex:
+    """Static index over many ranges. Counting overlaps is O(log n), listing matches O(log n + k).
+
+    Ranges are sorted by start and put in the leaves of a segment tree whose nodes know the largest and
+    smallest end below them, so whole subtrees that can not match are skipped.
+    """
+
+    def __init__(self, ranges: Iterable[Range]) -> None:
+        self.ranges = sorted(ranges, key=lambda r: (r.start, r.end))
+        self.starts = [r.start for r in self.ranges]
+        self.sorted_ends = sorted(r.end for r in self.ranges)
+
+        self.num_leaves = 1
+        while self.num_leaves < len(self.ranges):
+            self.num_leaves *= 2
+        self.max_end: List[float] = [float('-inf')] * (2 * self.num_leaves)
+        self.min_end: List[float] = [float('inf')] * (2 * self.num_leaves)
+        for i, r in enumerate(self.ranges):
+            self.max_end[self.num_leaves + i] = self.min_end[self.num_leaves + i] = r.end
+        for node in reversed(range(1, self.num_leaves)):
+            self.max_end[node] = max(self.max_end[2 * node], self.max_end[2 * node + 1])
+            self.min_end[node] = min(self.min_end[2 * node], self.min_end[2 * node + 1])
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def _nodes_covering(self, lo: int, hi: int) -> Iterator[int]:
+        """Subtree roots that together hold exactly the sorted ranges [lo, hi)."""
+        lo += self.num_leaves
+        hi += self.num_leaves
+        while lo < hi:
+            if lo & 1:
+                yield lo
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                yield hi
+            lo //= 2
+            hi //= 2
+
+    def _collect(self, lo: int, hi: int, end_at_least: float, end_at_most: float) -> List[Range]:
+        found = []
+        stack = list(self._nodes_covering(lo, hi))
+        while stack:
+            node = stack.pop()
+            if self.max_end[node] < end_at_least or self.min_end[node] > end_at_most:
+                continue
+            if node >= self.num_leaves:
+                found.append(self.ranges[node - self.num_leaves])
+            else:
+                stack.extend((2 * node, 2 * node + 1))
+        found.sort(key=lambda r: (r.start, r.end))
+        return found
+
+    def overlapping(self, query: Range) -> List[Range]:
+        return self._collect(0, bisect_right(self.starts, query.end), query.start, float('inf'))
+
+    def count_overlapping(self, query: Range) -> int:
+        """Everything but the ranges ending before the query or starting after it"""
+        ends_before = bisect_left(self.sorted_ends, query.start)
+        starts_after = len(self.starts) - bisect_right(self.starts, query.end)
+        return len(self.ranges) - ends_before - starts_after
+
+    def stabbing(self, section: int) -> List[Range]:
+        return self.overlapping(Range(section, section))
+
+    def containing(self, query: Range) -> List[Range]:
+        return self._collect(0, bisect_right(self.starts, query.start), query.end, float('inf'))
+
+    def contained_in(self, query: Range) -> List[Range]:
+        lo, hi = bisect_left(self.starts, query.start), bisect_right(self.starts, query.end)
+        return self._collect(lo, hi, float('-inf'), query.end)
+
+    def count_overlapping_pairs(self) -> int:
+        """Pairs of indexed ranges that overlap, in O(n log n).
+        A range overlaps every range sorted before it, except the ones that end before it starts."""
+        return sum(
+            i - bisect_left(self.sorted_ends, r.start)
+            for i, r in enumerate(self.ranges))
+
+
+def create_range_index(lines: Iterable[str]) -> RangeIndex:
+    return RangeIndex(r for line in lines for r in create_ranges(line))
+
+
+# Columnar path: whole blocks of lines become four int columns, and the comparisons run
+# element-wise through map over the columns, so no Python code runs per line
+Columns = Tuple[array, array, array, array]
+SEPARATORS_TO_SPACES = bytes.maketrans(b'-,', b'  ')
+
+
+def parse_columns(block: bytes, first_line: int = 1) -> Columns:
+    """first_line is the number of the block's first line within the file, for reporting bad lines."""
+    numbers = array('q', map(int, block.translate(SEPARATORS_TO_SPACES).split()))
+    if len(numbers) % 4:
+        raise SystemError('every line needs exactly four section numbers')
+    left_start, left_end, right_start, right_end = (numbers[i::4] for i in range(4))
+
+    if not (all(map(operator.le, left_start, left_end)) and all(map(operator.le, right_start, right_end))):
+        bad_line = next(
+            i for i, ends in enumerate(zip(left_start, left_end, right_start, right_end))
+            if ends[0] > ends[1] or ends[2] > ends[3])
+        print(first_line + bad_line, block.splitlines()[bad_line])
+        raise SystemError('bad range?')
+    return left_start, left_end, right_start, right_end
+
+
+def count_fully_contained(columns: Columns) -> int:
+    left_start, left_end, right_start, right_end = columns
+    left_contains_right = map(
+        operator.and_, map(operator.le, left_start, right_start), map(operator.le, right_end, left_end))
+    right_contains_left = map(
+        operator.and_, map(operator.le, right_start, left_start), map(operator.le, left_end, right_end))
+    return sum(map(operator.or_, left_contains_right, right_contains_left))
+
+
+def count_overlapping(columns: Columns) -> int:
+    left_start, left_end, right_start, right_end = columns
+    return sum(map(operator.and_, map(operator.le, left_start, right_end), map(operator.le, right_start, left_end)))
+
+
+def columnar_counts(blocks: Iterable[bytes]) -> Tuple[int, int]:
+    """(part 1, part 2) over blocks of whole lines, one block's columns in memory at a time"""
+    fully_contained = overlapping = 0
+    first_line = 1
+    for block in blocks:
+        columns = parse_columns(block, first_line)
+        first_line += block.count(b'\n')
+        fully_contained += count_fully_contained(columns)
+        overlapping += count_overlapping(columns)
+    return fully_contained, overlapping
+
+
+def columnar_counts_of_file(file_name: str) -> Tuple[int, int]:
+    return columnar_counts(iter_byte_blocks(file_name))
+
+
+def part_1(lines: Iterable[str]) -> int:
     num_fully_contained = 0
     for line in lines:
         left, right = create_ranges(line)
@@ -43,7 +183,7 @@ def part_1(lines: List[str]) -> int:
     return num_fully_contained
 
 
-def part_2(lines: List[str]) -> int:
+def part_2(lines: Iterable[str]) -> int:
     overlaps = 0
     for line in lines:
         left, right = create_ranges(line)
@@ -52,6 +192,7 @@ def part_2(lines: List[str]) -> int:
     return overlaps
 
 
-lines = read_file('day04/input.txt')
-print('part1', part_1(lines))
-print('part2', part_2(lines))
+if __name__ == '__main__':
+    lines = read_file('day04/input.txt')
+    print('part1', part_1(lines))
+    print('part2', part_2(lines))
@@ -1,69 +1,125 @@
-from dataclasses import dataclass, field
-from typing import ClassVar, Dict, List
+from array import array
+from typing import Iterator, List, Tuple
 
 from utils import read_file
 
 import re
 
 
-@dataclass
-class Operation:
-    operation_extractor: ClassVar[re.Pattern] = re.compile('(move)|(from)|(to)')
-    raw_operation: str
-    amount: int = field(default=0, init=False)
-    source_stack: str = field(default='', init=False)
-    target_stack: str = field(default='', init=False)
+Stacks = List[List[str]]
 
-    def __post_init__(self) -> None:
-        amount, src, dst = Operation.operation_extractor.sub('', self.raw_operation).split()
-        self.amount = int(amount)
-        self.source_stack = src
-        self.target_stack = dst
 
+def compile_operations(operation_lines: List[str]) -> array:
+    """'move 3 from 1 to 2' lines -> packed (amount, source, target) triples with 0 based stack indices"""
+    tokens = ' '.join(operation_lines).split()
+    if tokens[0::6] != ['move'] * len(operation_lines) or len(tokens) != 6 * len(operation_lines):
+        raise SystemError('operations must look like: move <amount> from <stack> to <stack>')
 
-def create_initial_stacks(stack_lines: List[str]) -> Dict[str, List[str]]:
+    operations = array('q', bytes(8 * 3 * len(operation_lines)))
+    operations[0::3] = array('q', map(int, tokens[1::6]))
+    operations[1::3] = array('q', [int(src) - 1 for src in tokens[3::6]])
+    operations[2::3] = array('q', [int(dst) - 1 for dst in tokens[5::6]])
+    return operations
+
+
+def iter_operations(operations: array) -> Iterator[Tuple[int, int, int]]:
+    packed = iter(operations)
+    return zip(packed, packed, packed)
+
+
+def create_initial_stacks(stack_lines: List[str]) -> Stacks:
     largest_stack_num = int(stack_lines.pop().split()[-1])
-    stacks: Dict[str, List[str]] = {str(i): [] for i in range(1, largest_stack_num + 1)}
+    stacks: Stacks = [[] for _ in range(largest_stack_num)]
     item_pattern = re.compile(r"\[(\w)\]")
     for line in reversed(stack_lines):
         for match in item_pattern.finditer(line):
-            stacks[str(match.start() // 4 + 1)].append(match.group(1))
+            stacks[match.start() // 4].append(match.group(1))
     return stacks
 
 
-def apply_operation_part_2(op: Operation, stacks: Dict[str, List[str]]) -> None:
-    stacks[op.target_stack].extend(stacks[op.source_stack][-op.amount:])
-    stacks[op.source_stack] = stacks[op.source_stack][:-op.amount]
+# Crates leave the source stack by truncating it in place, so a move costs O(amount)
+def apply_operations_part_2(operations: array, stacks: Stacks) -> None:
+    for amount, src, dst in iter_operations(operations):
+        source_stack = stacks[src]
+        remaining = len(source_stack) - amount
+        stacks[dst].extend(source_stack[remaining:])
+        del source_stack[remaining:]
+
+
+def apply_operations_part_1(operations: array, stacks: Stacks) -> None:
+    for amount, src, dst in iter_operations(operations):
+        source_stack = stacks[src]
+        remaining = len(source_stack) - amount
+        moved = source_stack[remaining:]
+        moved.reverse()
+        stacks[dst].extend(moved)
+        del source_stack[remaining:]
+
+
+def read_stack_tops(stacks: Stacks) -> str:
+    return ''.join([group[-1] if group else '' for group in stacks])
+
 
+def final_heights(stacks: Stacks, operations: array) -> List[int]:
+    heights = [len(stack) for stack in stacks]
+    for amount, src, dst in iter_operations(operations):
+        if amount > heights[src]:
+            raise SystemError(f'cannot move {amount} crates off a stack of {heights[src]}')
+        heights[src] -= amount
+        heights[dst] += amount
+    return heights
 
-def apply_operation_part_1(op: Operation, stacks: Dict[str, List[str]]) -> None:
-    stacks[op.target_stack].extend(reversed(stacks[op.source_stack][-op.amount:]))
-    stacks[op.source_stack] = stacks[op.source_stack][:-op.amount]
 
+def trace_stack_tops(stacks: Stacks, operations: array, crane_reverses: bool) -> str:
+    """Finds the final top crates without moving any: every top position is followed backwards through
+    the operations to where its crate started out. O(stacks * operations), however many crates move."""
+    heights = final_heights(stacks, operations)
+    # tracked[i] is the (stack, height from the bottom) that stack i's final top crate occupies at this point
+    tracked = [(i, height - 1) for i, height in enumerate(heights)]
 
-def read_stack_tops(stacks: Dict[str, List[str]]) -> str:
-    return ''.join([group[-1] if group else '' for group in stacks.values()])
+    for op_index in reversed(range(0, len(operations), 3)):
+        amount, src, dst = operations[op_index:op_index + 3]
+        dst_before, src_before = heights[dst] - amount, heights[src] + amount
+        for i, (stack, position) in enumerate(tracked):
+            if stack == dst and position >= dst_before:
+                offset = position - dst_before
+                tracked[i] = (src, src_before - 1 - offset if crane_reverses else src_before - amount + offset)
+        heights[dst], heights[src] = dst_before, src_before
 
+    return ''.join(stacks[stack][position] if position >= 0 else '' for stack, position in tracked)
 
-def part_1(lines: List[str]) -> str:
+
+def parse(lines: List[str]) -> Tuple[Stacks, array]:
     image_end_index = lines.index('')
     stacks = create_initial_stacks(lines[:image_end_index])
-    operations = [Operation(line) for line in lines[image_end_index + 1:]]
-    for operation in operations:
-        apply_operation_part_1(operation, stacks)
+    operations = compile_operations(lines[image_end_index + 1:])
+    return stacks, operations
+
+
+# The parts move crates around in the parsed stacks, parse again for every part
+def part_1(stacks_and_operations: Tuple[Stacks, array]) -> str:
+    stacks, operations = stacks_and_operations
+    apply_operations_part_1(operations, stacks)
     return read_stack_tops(stacks)
 
 
-def part_2(lines: List[str]) -> str:
-    image_end_index = lines.index('')
-    stacks = create_initial_stacks(lines[:image_end_index])
-    operations = [Operation(line) for line in lines[image_end_index + 1:]]
-    for operation in operations:
-        apply_operation_part_2(operation, stacks)
+def part_2(stacks_and_operations: Tuple[Stacks, array]) -> str:
+    stacks, operations = stacks_and_operations
+    apply_operations_part_2(operations, stacks)
     return read_stack_tops(stacks)
 
 
-lines = read_file('day05/input.txt')
+# Same answers from tracing, the parsed stacks are left untouched
+def part_1_traced(stacks_and_operations: Tuple[Stacks, array]) -> str:
+    return trace_stack_tops(*stacks_and_operations, crane_reverses=True)
+
+
+def part_2_traced(stacks_and_operations: Tuple[Stacks, array]) -> str:
+    return trace_stack_tops(*stacks_and_operations, crane_reverses=False)
+
+
+if __name__ == '__main__':
+    lines = read_file('day05/input.txt')
 
-print('part1', part_1(lines))
-print('part2', part_2(lines))
+    print('part1', part_1(parse(lines)))
+    print('part2', part_2(parse(lines)))
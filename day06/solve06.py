@@ -1,48 +1,128 @@
-from collections import deque
-from typing import Dict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+from typing import Dict, IO, Iterable, List, Optional, Sequence, Tuple
 
-from utils import read_file
+from utils import byte_block_bounds, read_byte_range, read_file
 
 
-class Window:
+CHUNK_SIZE = 1 << 20
 
-    def __init__(self, capacity: int) -> None:
-        self.capacity = capacity
-        self.char_to_count: Dict[str, int] = {}
-        self.q_characters: deque = deque()
 
-    def number_of_unique_characters(self) -> int:
-        return len(self.char_to_count)
+class MarkerScanner:
+    """Finds the first marker (a run of `width` distinct symbols) for several widths in one pass.
 
-    def push(self, char: str) -> None:
-        if (len(self.q_characters) == self.capacity):
-            oldest_element = self.q_characters.popleft()
-            self.char_to_count[oldest_element] -= 1
-            if self.char_to_count[oldest_element] == 0:
-                self.char_to_count.pop(oldest_element)
+    Tracks where every symbol was last seen, so the current run of distinct symbols starts right after the
+    latest repeat. Data can be fed in chunks, markers spanning two chunks are found all the same.
+    """
 
-        self.q_characters.append(char)
-        self.char_to_count[char] = self.char_to_count.get(char, 0) + 1
+    def __init__(self, widths: Iterable[int]) -> None:
+        self.pending: List[int] = sorted(set(widths))
+        self.found: Dict[int, int] = {}
+        self.last_seen = [-1] * 256
+        self.run_start = 0
+        self.position = 0
 
+    @property
+    def done(self) -> bool:
+        return not self.pending
 
-def find_start_of_packet(packet_line: str, num_unique_chars: int) -> int:
-    window = Window(capacity=num_unique_chars)
-    for i, character in enumerate(packet_line):
-        window.push(character)
-        if window.number_of_unique_characters() == num_unique_chars:
-            return i + 1
+    def feed(self, chunk: bytes) -> bool:
+        """Returns whether every marker has been found."""
+        last_seen, run_start, position = self.last_seen, self.run_start, self.position
+        pending = self.pending
+        narrowest = pending[0] if pending else 0
 
-    raise SystemError(f'never saw {num_unique_chars} unique characters in string: {packet_line}')
+        for symbol in chunk:
+            if last_seen[symbol] >= run_start:
+                run_start = last_seen[symbol] + 1
+            last_seen[symbol] = position
+            position += 1
+            while pending and position - run_start >= narrowest:
+                self.found[pending.pop(0)] = position
+                narrowest = pending[0] if pending else 0
+            if not pending:
+                break
 
+        self.run_start, self.position = run_start, position
+        return self.done
 
-def part_1(line: str) -> int:
+
+def find_markers_in_chunks(chunks: Iterable[bytes], widths: Iterable[int]) -> Dict[int, int]:
+    """Width -> number of symbols read when its first marker completed. Widths never seen are left out."""
+    scanner = MarkerScanner(widths)
+    for chunk in chunks:
+        if scanner.feed(chunk):
+            break
+    return scanner.found
+
+
+def find_markers(datastream: bytes, widths: Iterable[int]) -> Dict[int, int]:
+    return find_markers_in_chunks([datastream], widths)
+
+
+def iter_chunks(stream: IO[bytes], chunk_size: int = CHUNK_SIZE) -> Iterable[bytes]:
+    while chunk := stream.read(chunk_size):
+        yield chunk.rstrip(b'\r\n')
+
+
+def find_markers_in_file(file_name: str, widths: Iterable[int]) -> Dict[int, int]:
+    with open(file_name, 'rb') as stream:
+        return find_markers_in_chunks(iter_chunks(stream), widths)
+
+
+def find_markers_of_streams(datastreams: Iterable[bytes], widths: Sequence[int]) -> List[Tuple[Optional[int], ...]]:
+    """One tuple per stream, holding the marker offset for each of widths (in that order) or None."""
+    markers = []
+    for datastream in datastreams:
+        found = find_markers(datastream, widths)
+        markers.append(tuple(found.get(width) for width in widths))
+    return markers
+
+
+def find_markers_of_range(
+        file_name: str, start: int, end: int, widths: Sequence[int]) -> List[Tuple[Optional[int], ...]]:
+    return find_markers_of_streams(read_byte_range(file_name, start, end).splitlines(), widths)
+
+
+def find_markers_of_file(
+        file_name: str, widths: Sequence[int], jobs: int = 1,
+        block_size: int = CHUNK_SIZE) -> List[Tuple[Optional[int], ...]]:
+    """Markers of every line of a file of independent datastreams, in line order.
+
+    The file is cut into blocks of whole lines and each worker reads its own blocks, so only offsets and
+    results travel between processes.
+    """
+    bounds = byte_block_bounds(file_name, block_size)
+    starts, ends = [start for start, _ in bounds], [end for _, end in bounds]
+    names, all_widths = repeat(file_name, len(bounds)), repeat(tuple(widths), len(bounds))
+    if jobs == 1:
+        per_block = list(map(find_markers_of_range, names, starts, ends, all_widths))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            per_block = list(executor.map(find_markers_of_range, names, starts, ends, all_widths))
+    return list(chain.from_iterable(per_block))
+
+
+def find_start_of_packet(packet_line: bytes, num_unique_chars: int) -> int:
+    if found := find_markers(packet_line, [num_unique_chars]):
+        return found[num_unique_chars]
+
+    raise SystemError(f'never saw {num_unique_chars} unique characters in string: {packet_line!r}')
+
+
+def parse(lines: List[str]) -> bytes:
+    return lines[0].encode()
+
+
+def part_1(line: bytes) -> int:
     return find_start_of_packet(line, 4)
 
 
-def part_2(line: str) -> int:
+def part_2(line: bytes) -> int:
     return find_start_of_packet(line, 14)
 
 
-line = read_file('day06/input.txt')[0]
-print('part1', part_1(line))  # type: ignore
-print('part2', part_2(line))  # type: ignore
+if __name__ == '__main__':
+    line = parse(read_file('day06/input.txt'))
+    print('part1', part_1(line))  # type: ignore
+    print('part2', part_2(line))  # type: ignore
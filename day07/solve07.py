@@ -1,32 +1,27 @@
+from bisect import bisect_left, bisect_right, insort
 from collections import deque
-from enum import Enum
-from pathlib import PurePath
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 
-from utils import read_file
+from utils import iter_lines
 
-import re
 
-
-class NodeType(Enum):
-    DIRECTORY = 0
-    FILE = 1
+BUCKET_SIZE = 256
 
 
 class Node:
-    def __init__(self, name: str, type_: NodeType, parent: Optional['Node'], size: int) -> None:
+    """A directory. Its files are only names and sizes in a dict, they get no node of their own."""
+    __slots__ = ('name', 'parent', 'total_size', 'children', 'files')
+
+    def __init__(self, name: str, parent: Optional['Node']) -> None:
         self.name: str = name
-        self.type: NodeType = type_
         self.parent: Optional['Node'] = parent
-        self.size: int = size
         self.total_size: int = 0
-        self.children: dict[str, 'Node'] = {}
-        if type_ == NodeType.DIRECTORY and size:
-            raise SystemError('directory with non-zero size')
+        self.children: Dict[str, 'Node'] = {}
+        self.files: Dict[str, int] = {}
 
     def absolute_path(self) -> str:
-        parent_names = [parent.name for parent in reversed(self.all_parents())]
-        return str(PurePath('/', '/'.join(parent_names), self.name))
+        names = [parent.name for parent in reversed(self.all_parents())] + [self.name]
+        return '/'.join(names) or '/'
 
     def all_parents(self) -> List['Node']:
         parent = self.parent
@@ -36,27 +31,137 @@ class Node:
             parent = parent.parent
         return all_parents
 
-    def get_or_create_child(self, name: str, node_type: NodeType, size: int) -> 'Node':
+    def get_or_create_child(self, name: str) -> 'Node':
         if (name == '/'):
             return self
 
         if name not in self.children:
-            self.children[name] = Node(name, node_type, self, size)
+            self.children[name] = Node(name, self)
 
         return self.children[name]
 
 
+class DirectorySizeIndex:
+    """Directory sizes kept sorted in buckets of up to 2 * BUCKET_SIZE, with a Fenwick tree over the bucket sums.
+
+    Adding or removing a size and both queries cost O(log D + BUCKET_SIZE), where the BUCKET_SIZE part is a
+    bisect or a sum over a short list. Only splitting or dropping a bucket rebuilds the Fenwick tree.
+    """
+
+    def __init__(self, sizes: Iterable[int]) -> None:
+        ordered = sorted(sizes)
+        self.buckets = [ordered[i:i + BUCKET_SIZE] for i in range(0, len(ordered), BUCKET_SIZE)]
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self.maxes = [bucket[-1] for bucket in self.buckets]
+        self.tree = [0] * (len(self.buckets) + 1)
+        for b, bucket in enumerate(self.buckets):
+            self._add_to_tree(b, sum(bucket))
+
+    def _add_to_tree(self, b: int, delta: int) -> None:
+        b += 1
+        while b < len(self.tree):
+            self.tree[b] += delta
+            b += b & -b
+
+    def _sum_of_buckets_before(self, b: int) -> int:
+        total = 0
+        while b:
+            total += self.tree[b]
+            b -= b & -b
+        return total
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.buckets)
+
+    def add(self, size: int) -> None:
+        if not self.buckets:
+            self.buckets = [[size]]
+            self._rebuild()
+            return
+
+        b = min(bisect_left(self.maxes, size), len(self.buckets) - 1)
+        bucket = self.buckets[b]
+        insort(bucket, size)
+        self.maxes[b] = bucket[-1]
+        self._add_to_tree(b, size)
+        if len(bucket) > 2 * BUCKET_SIZE:
+            self.buckets[b:b + 1] = [bucket[:BUCKET_SIZE], bucket[BUCKET_SIZE:]]
+            self._rebuild()
+
+    def remove(self, size: int) -> None:
+        b = bisect_left(self.maxes, size)
+        bucket = self.buckets[b] if b < len(self.buckets) else []
+        i = bisect_left(bucket, size)
+        if i == len(bucket) or bucket[i] != size:
+            raise SystemError(f'no directory of size {size} to remove')
+
+        del bucket[i]
+        if bucket:
+            self.maxes[b] = bucket[-1]
+            self._add_to_tree(b, -size)
+        else:
+            del self.buckets[b]
+            self._rebuild()
+
+    def smallest_at_least(self, size: int) -> Optional[int]:
+        b = bisect_left(self.maxes, size)
+        if b == len(self.buckets):
+            return None
+        bucket = self.buckets[b]
+        return bucket[bisect_left(bucket, size)]
+
+    def sum_at_most(self, size: int) -> int:
+        b = bisect_right(self.maxes, size)
+        if b == len(self.buckets):
+            return self._sum_of_buckets_before(b)
+        bucket = self.buckets[b]
+        return self._sum_of_buckets_before(b) + sum(bucket[:bisect_right(bucket, size)])
+
+
 class FileTree:
+    """total_size of every directory is kept current as files are added.
+
+    Once the size index exists, the tree remembers the size every directory had before it first changed
+    since the last query, and the next query moves just those directories within the index.
+    """
 
     def __init__(self) -> None:
-        self.root = Node('', NodeType.DIRECTORY, None, 0)
+        self.root = Node('', None)
         self.current_dir: 'Node' = self.root
+        self.directories: List[Node] = [self.root]
+        self._size_index: Optional[DirectorySizeIndex] = None
+        self._resized: Dict[Node, Optional[int]] = {}  # None for directories the index has not seen yet
+
+    def _get_or_create_child(self, parent: Node, name: str) -> Node:
+        is_new = name != '/' and name not in parent.children
+        child = parent.get_or_create_child(name)
+        if is_new:
+            self.directories.append(child)
+            if self._size_index is not None:
+                self._resized[child] = None
+        return child
+
+    def _add_to_ancestors(self, directory: Optional[Node], delta: int) -> None:
+        """directory itself included"""
+        track = self._size_index is not None
+        while directory:
+            if track and directory not in self._resized:
+                self._resized[directory] = directory.total_size
+            directory.total_size += delta
+            directory = directory.parent
 
     def mkdir(self, name: str) -> None:
-        self.current_dir.get_or_create_child(name, NodeType.DIRECTORY, 0)
+        self._get_or_create_child(self.current_dir, name)
 
     def touch_file(self, name: str, size: int) -> None:
-        self.current_dir.get_or_create_child(name, NodeType.FILE, size)
+        """Touching a known file again with another size updates the sizes above it by the difference."""
+        files = self.current_dir.files
+        delta = size - files.get(name, 0)
+        files[name] = size
+        if delta:
+            self._add_to_ancestors(self.current_dir, delta)
 
     def cd(self, path_str: str) -> None:
         if path_str == '..':
@@ -65,16 +170,31 @@ class FileTree:
             self.current_dir = self.current_dir.parent
             return
 
-        path = PurePath(path_str)
-        iter_node = self.root if path.is_absolute() else self.current_dir
-        for path_segment in path.parts:
-            iter_node = iter_node.get_or_create_child(path_segment, NodeType.DIRECTORY, 0)
+        iter_node = self.root if path_str.startswith('/') else self.current_dir
+        for path_segment in path_str.split('/'):
+            if path_segment == '..':
+                iter_node = iter_node.parent or iter_node
+            elif path_segment:
+                iter_node = self._get_or_create_child(iter_node, path_segment)
 
         self.current_dir = iter_node
 
     def pwd(self) -> str:
         return self.current_dir.absolute_path()
 
+    def size_index(self) -> DirectorySizeIndex:
+        """Built on first use, afterwards only the directories resized since the last query are moved."""
+        if self._size_index is None:
+            self._size_index = DirectorySizeIndex(directory.total_size for directory in self.directories)
+            return self._size_index
+
+        for directory, old_size in self._resized.items():
+            if old_size is not None:
+                self._size_index.remove(old_size)
+            self._size_index.add(directory.total_size)
+        self._resized.clear()
+        return self._size_index
+
     def collect_all_nodes(self) -> List[Node]:
         node_q: deque[Node] = deque()
         node_q.append(self.root)
@@ -83,79 +203,66 @@ class FileTree:
         while node_q:
             node = node_q.pop()
             all_nodes.append(node)
-            if node.type == NodeType.DIRECTORY:
-                for child in node.children.values():
-                    node_q.append(child)
+            node_q.extend(node.children.values())
 
         return all_nodes
 
 
-def process_ls_output(file_tree: 'FileTree', commands: List[str]) -> None:
-    while commands and not commands[-1].startswith('$'):
-        output_line = commands.pop()
-        if output_line.startswith('dir'):
-            file_tree.mkdir(output_line[4:])
-        elif re.fullmatch(r'\d+ \S+', output_line):
-            size_str, name = output_line.split(' ')
-            file_tree.touch_file(name, int(size_str))
-        else:
-            SystemError('ls output format not recognized')
-
+def build_file_tree(commands_and_outputs: Iterable[str]) -> 'FileTree':
+    """Consumes the terminal log front to back, one line at a time.
 
-def build_file_tree(commands_and_outputs: List[str]) -> 'FileTree':
+    Lines are dispatched on their first four characters; anything that is not a command or a directory
+    must be a file listed by ls.
+    """
     file_tree = FileTree()
 
-    cd_pattern = re.compile(r'\$ cd (.*)')
-    while commands_and_outputs:
-        cmd = commands_and_outputs.pop()
-        if cd_match := cd_pattern.match(cmd):
-            file_tree.cd(cd_match.group(1))
-        elif cmd == '$ ls':
-            process_ls_output(file_tree, commands_and_outputs)
-        else:
-            print(cmd)
-            raise SystemError('debug me')
+    def touch_file(line: str) -> None:
+        size_str, _, name = line.partition(' ')
+        if not (size_str.isdigit() and name):
+            raise SystemError(f'line not recognized: {line}')
+        file_tree.touch_file(name, int(size_str))
+
+    handlers: Dict[str, Callable[[str], None]] = {
+        '$ cd': lambda line: file_tree.cd(line[5:]),
+        '$ ls': lambda line: None,
+        'dir ': lambda line: file_tree.mkdir(line[4:]),
+    }
+    for line in commands_and_outputs:
+        handlers.get(line[:4], touch_file)(line)
 
     return file_tree
 
 
-def calculate_node_sizes(node: Node) -> int:
-    if node.type == NodeType.FILE:
-        node.total_size = node.size
-        return node.size
+def build_file_tree_of_file(file_name: str) -> 'FileTree':
+    """Only the tree is kept in memory, never the log."""
+    return build_file_tree(iter_lines(file_name))
 
-    for child in node.children.values():
-        node.total_size += calculate_node_sizes(child)
 
+def calculate_node_sizes(node: Node) -> int:
+    """Recomputes every total_size below node from scratch. FileTree keeps them current already."""
+    node.total_size = sum(node.files.values()) + sum(calculate_node_sizes(child) for child in node.children.values())
     return node.total_size
 
 
-def part_1(lines: List[str]) -> int:
-    tree = build_file_tree(list(reversed(lines)))
-    calculate_node_sizes(tree.root)
-    nodes = tree.collect_all_nodes()
-    return sum(
-        node.total_size
-        for node in nodes
-        if node.type == NodeType.DIRECTORY and node.total_size <= 100000)
+def parse(lines: Iterable[str]) -> 'FileTree':
+    return build_file_tree(lines)
+
+
+def part_1(tree: 'FileTree') -> int:
+    return tree.size_index().sum_at_most(100000)
 
 
-def part_2(lines: List[str]) -> int:
+def part_2(tree: 'FileTree') -> int:
     TOTAL_DISK_SPACE = 70_000_000
     REQUIRED_SPACE = 30_000_000
 
-    tree = build_file_tree(list(reversed(lines)))
-    calculate_node_sizes(tree.root)
-
     space_to_free_up = REQUIRED_SPACE - (TOTAL_DISK_SPACE - tree.root.total_size)
-    candidate_dirs_to_delete = [
-        node for node in tree.collect_all_nodes()
-        if node.type == NodeType.DIRECTORY and node.total_size >= space_to_free_up]
-
-    candidate_dirs_to_delete.sort(key=lambda node: node.total_size)
-    return candidate_dirs_to_delete[0].total_size
+    if (size := tree.size_index().smallest_at_least(space_to_free_up)) is None:
+        raise SystemError(f'no directory frees up {space_to_free_up}')
+    return size
 
 
-lines = read_file('day07/input.txt')
-print('part1', part_1(lines))  # type: ignore
-print('part2', part_2(lines))  # type: ignore
+if __name__ == '__main__':
+    tree = build_file_tree_of_file('day07/input.txt')
+    print('part1', part_1(tree))  # type: ignore
+    print('part2', part_2(tree))  # type: ignore
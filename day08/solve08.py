@@ -1,90 +1,143 @@
-from typing import List, Set, Tuple
-
-from utils import Point2D, read_file
-
-import math
-
-
-def get_visibility_of_array_from_left(trees: List[int]) -> Set[int]:
-    max_length_so_far = -1
-    indices: Set[int] = set()
-    for i, tree_length in enumerate(trees):
-        if tree_length > max_length_so_far:
-            max_length_so_far = tree_length
-            indices.add(i)
-    return indices
-
-
-def get_visibility_of_array(trees: List[int]) -> Set[int]:
-    len_trees = len(trees)
-    visible_trees_from_left = get_visibility_of_array_from_left(trees)
-    visible_trees_from_rite = {
-        (len_trees - i - 1)
-        for i in get_visibility_of_array_from_left(list(reversed(trees)))}
-
-    return set.union(visible_trees_from_left, visible_trees_from_rite)
-
-
-def transpose(matrix: List[List]) -> List[List]:
-    if not matrix:
-        return []
-    num_cols = len(matrix[0])
-    return [[row[i] for row in matrix] for i in range(num_cols)]
-
-
-def get_horizontal_visibility_of_array_matrix(forest: List[List[int]]) -> Set[Tuple[int, int]]:
-    visible_trees: Set[Tuple[int, int]] = set()
-
-    for i, trees in enumerate(forest):
-        linear_indices = get_visibility_of_array(trees)
-        for index in linear_indices:
-            visible_trees.add((i, index))
-
-    return visible_trees
-
-
-def part_1(forest: List[List[int]]) -> Set[Tuple[int, int]]:
-    visible_trees_from_sides = get_horizontal_visibility_of_array_matrix(forest)
-    visible_trees_from_updown = {
-        (y, x) for x, y in get_horizontal_visibility_of_array_matrix(transpose(forest))}
-
-    return set.union(
-        visible_trees_from_sides,
-        visible_trees_from_updown)
-
-
-def count_in_direction(forest: List[List[int]], from_location: Point2D, direction: Point2D) -> int:
-    reference_value = forest[from_location.i][from_location.j]
-    current_location = from_location + direction
-    visible_tree_count = 0
-
-    while (current_location.in_bounding_box(NORTH_WEST, SOUTH_EAST)):
-        visible_tree_count += 1
-        if forest[current_location.i][current_location.j] >= reference_value:
-            break
-        current_location += direction
-
-    return visible_tree_count
-
-
-def part_2(forest: List[List[int]]) -> int:
-    directions = [Point2D(1, 0), Point2D(0, 1), Point2D(-1, 0), Point2D(0, -1)]
-    best_score = (0-0)
-    for i in range(I):
-        for j in range(J):
-            score = math.prod([
-                count_in_direction(forest, Point2D(i, j), direction)
-                for direction in directions])
-
-            best_score = max(score, best_score)
-
-    return best_score
-
-
-lines = read_file('day08/input.txt')
-forest = [[int(char) for char in row] for row in lines]
-NORTH_WEST, SOUTH_EAST = Point2D(0, 0), Point2D(len(forest) - 1, len(forest[0]) - 1)
-I, J = len(forest), len(forest[0])
-
-print('part1', len(part_1(forest)))
-print('part2', part_2(forest))
+from array import array
+from typing import Iterable, List, Tuple
+
+import heapq
+
+from utils import Grid, read_file
+
+
+DIGITS = bytes.maketrans(b'0123456789', bytes(range(10)))
+
+
+def parse(lines: List[str]) -> Grid:
+    return Grid.from_lines(lines, translation=DIGITS)
+
+
+def mark_visible_along(forest: Grid, indices: Iterable[int], visible: bytearray) -> None:
+    tallest_so_far = -1
+    cells = forest.cells
+    for index in indices:
+        if cells[index] > tallest_so_far:
+            tallest_so_far = cells[index]
+            visible[index] = 1
+            if tallest_so_far == 9:
+                return
+
+
+def part_1(forest: Grid) -> int:
+    visible = bytearray(len(forest))
+    for i in range(forest.height):
+        mark_visible_along(forest, forest.row_indices(i), visible)
+        mark_visible_along(forest, reversed(forest.row_indices(i)), visible)
+    for j in range(forest.width):
+        mark_visible_along(forest, forest.column_indices(j), visible)
+        mark_visible_along(forest, reversed(forest.column_indices(j)), visible)
+    return sum(visible)
+
+
+def multiply_viewing_distances(forest: Grid, indices: range, scores: array) -> None:
+    """Multiplies into scores how far every tree on the line sees looking back towards the start of indices.
+
+    The stack holds the trees not yet hidden behind a taller or equally tall one, so its heights never
+    increase. Whatever a new tree pops is shorter and within its view, the tree left on top blocks it.
+    Every tree is pushed and popped once, making the whole line O(len(indices)).
+    """
+    cells, step, first = forest.cells, indices.step, indices.start
+    stack: List[int] = []
+    for index in indices:
+        height = cells[index]
+        while stack and cells[stack[-1]] < height:
+            stack.pop()
+        scores[index] *= (index - (stack[-1] if stack else first)) // step
+        stack.append(index)
+
+
+def scenic_scores(forest: Grid) -> array:
+    """Score of every cell by flat index, 0 on the padding."""
+    scores = array('Q', [0]) * len(forest)
+    ones = array('Q', [1]) * forest.width
+    for i in range(forest.height):
+        row = forest.row_indices(i)
+        scores[row.start:row.stop] = ones
+    for i in range(forest.height):
+        multiply_viewing_distances(forest, forest.row_indices(i), scores)
+        multiply_viewing_distances(forest, forest.row_indices(i)[::-1], scores)
+    for j in range(forest.width):
+        multiply_viewing_distances(forest, forest.column_indices(j), scores)
+        multiply_viewing_distances(forest, forest.column_indices(j)[::-1], scores)
+    return scores
+
+
+def part_2(forest: Grid) -> int:
+    return max(scenic_scores(forest))
+
+
+class Forest:
+    """A solved forest that stays solved as trees are cut or grown.
+
+    Visibility and viewing distances of a tree only depend on its row and column, so set_height re-sweeps
+    just the row and column of the edited tree, O(N). Horizontal and vertical parts are kept apart so
+    either can be redone alone. The best score comes from a max-heap that is only pruned lazily: entries
+    whose score has changed since they were pushed are dropped when they surface.
+    """
+
+    def __init__(self, grid: Grid) -> None:
+        self.grid = grid
+        self.horizontal_scores = array('Q', [0]) * len(grid)
+        self.vertical_scores = array('Q', [0]) * len(grid)
+        self.visible_horizontally = bytearray(len(grid))
+        self.visible_vertically = bytearray(len(grid))
+        for i in range(grid.height):
+            self._solve_line(grid.row_indices(i), self.horizontal_scores, self.visible_horizontally)
+        for j in range(grid.width):
+            self._solve_line(grid.column_indices(j), self.vertical_scores, self.visible_vertically)
+
+        self.visible_count = sum(self.is_visible(index) for index in grid.inner_indices())
+        self._best: List[Tuple[int, int]] = [(-self.score(index), index) for index in grid.inner_indices()]
+        heapq.heapify(self._best)
+
+    def _solve_line(self, indices: range, scores: array, visible: bytearray) -> None:
+        for index in indices:
+            scores[index], visible[index] = 1, 0
+        for line in (indices, indices[::-1]):
+            multiply_viewing_distances(self.grid, line, scores)
+            mark_visible_along(self.grid, line, visible)
+
+    def score(self, index: int) -> int:
+        return self.horizontal_scores[index] * self.vertical_scores[index]
+
+    def is_visible(self, index: int) -> bool:
+        return bool(self.visible_horizontally[index] or self.visible_vertically[index])
+
+    def set_height(self, i: int, j: int, height: int) -> None:
+        if not (0 <= i < self.grid.height and 0 <= j < self.grid.width and 0 <= height <= 9):
+            raise SystemError(f'can not grow a tree of height {height} at ({i}, {j})')
+
+        row, column = self.grid.row_indices(i), self.grid.column_indices(j)
+        index = self.grid.index(i, j)
+        affected = [*row, *(k for k in column if k != index)]
+
+        self.visible_count -= sum(self.is_visible(k) for k in affected)
+        self.grid[index] = height
+        self._solve_line(row, self.horizontal_scores, self.visible_horizontally)
+        self._solve_line(column, self.vertical_scores, self.visible_vertically)
+        self.visible_count += sum(self.is_visible(k) for k in affected)
+
+        for k in affected:
+            heapq.heappush(self._best, (-self.score(k), k))
+        if len(self._best) > 4 * self.grid.height * self.grid.width:
+            self._best = [(-self.score(k), k) for k in self.grid.inner_indices()]
+            heapq.heapify(self._best)
+
+    @property
+    def best_score(self) -> int:
+        best = self._best
+        while -best[0][0] != self.score(best[0][1]):
+            heapq.heappop(best)
+        return -best[0][0]
+
+
+if __name__ == '__main__':
+    forest = parse(read_file('day08/input.txt'))
+    print('part1', part_1(forest))
+    print('part2', part_2(forest))
@@ -0,0 +1,312 @@
+"""Day 8 straight from the input file, for forests that do not fit in memory.
+
+The digits are memory mapped as they are, one byte per tree, and cut into tiles that worker processes solve
+on their own. All a tile needs to know about the rest of its rows and columns is, for every height, the
+nearest tree at least that tall on each side: that decides visibility and seeds the monotonic stacks of
+solve08.multiply_viewing_distances.
+
+Tiles are handled a strip (a row of tiles) at a time, so the parent only ever holds one strip's worth of
+state plus one boundary row across the forest. A first pass goes up from the bottom, summarising what every
+strip has at the top of its columns and spilling the state below each strip to a temporary file. The
+second pass goes down from the top: it summarises the rows of a strip's tiles, folds those along the strip
+for the state left and right of every tile, solves the tiles, then carries the state above the next strip.
+Summaries hold positions relative to their tile in 16 bits, boundary states absolute positions in 32.
+"""
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Deque, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import mmap
+import tempfile
+
+
+TILE_SIZE = 1024
+HEIGHTS = 10
+ZERO = ord('0')
+EDGE = 0xff  # taller than any tree, the bottom of every stack
+NOWHERE_IN_TILE = 0xffff
+NOWHERE = 0xffffffff
+TASKS_PER_WORKER = 2
+
+
+@dataclass(frozen=True)
+class ForestFile:
+    file_name: str
+    height: int
+    width: int
+    stride: int
+
+    @classmethod
+    def open(cls, file_name: str) -> 'ForestFile':
+        """Rows may end in LF or CRLF, the last one may have no line ending at all."""
+        with open(file_name, 'rb') as inpfile:
+            try:
+                buffer = mmap.mmap(inpfile.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files can not be mapped
+                raise SystemError(f'{file_name} is not a rectangle of digits with one line per row')
+
+            with buffer:
+                line_end = buffer.find(b'\n')
+                if line_end == -1:
+                    width, terminator = len(buffer), 0
+                else:
+                    terminator = 2 if line_end and buffer[line_end - 1] == ord('\r') else 1
+                    width = line_end + 1 - terminator
+                stride = width + terminator
+                height = (len(buffer) + terminator) // stride if stride else 0
+                if width == 0 or len(buffer) not in (height * stride, height * stride - terminator):
+                    raise SystemError(f'{file_name} is not a rectangle of digits with one line per row')
+                line_ending = buffer[width:stride]
+                if any(buffer[i * stride + width:(i + 1) * stride] != line_ending for i in range(height - 1)):
+                    raise SystemError(f'{file_name} does not end every row the same way')
+        return cls(file_name, height, width, stride)
+
+
+@dataclass(frozen=True)
+class Tile:
+    top: int
+    bottom: int
+    left: int
+    right: int
+
+    @property
+    def height(self) -> int:
+        return self.bottom - self.top
+
+    @property
+    def width(self) -> int:
+        return self.right - self.left
+
+
+def read_tile(forest: ForestFile, tile: Tile) -> bytes:
+    """The tile's rows back to back, without line endings."""
+    with open(forest.file_name, 'rb') as inpfile:
+        with mmap.mmap(inpfile.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return b''.join(
+                buffer[i * forest.stride + tile.left:i * forest.stride + tile.right]
+                for i in range(tile.top, tile.bottom))
+
+
+@dataclass
+class TileSummary:
+    """Per row of the tile, HEIGHTS positions each: the last and first column holding a tree at least that
+    tall, and per column the last such row. Relative to the tile, NOWHERE_IN_TILE if there is none."""
+    row_last: array
+    row_first: array
+    column_last: array
+
+
+def iter_strip(forest: ForestFile, top: int, tile_size: int) -> Iterator[Tile]:
+    for left in range(0, forest.width, tile_size):
+        yield Tile(top, min(top + tile_size, forest.height), left, min(left + tile_size, forest.width))
+
+
+def last_at_least(line: bytes) -> List[int]:
+    nearest, by_height = -1, [NOWHERE_IN_TILE] * HEIGHTS
+    for height in reversed(range(HEIGHTS)):
+        nearest = max(nearest, line.rfind(ZERO + height))
+        if nearest != -1:
+            by_height[height] = nearest
+    return by_height
+
+
+def first_at_least(line: bytes) -> List[int]:
+    nearest, by_height = NOWHERE_IN_TILE, [NOWHERE_IN_TILE] * HEIGHTS
+    for height in reversed(range(HEIGHTS)):
+        if (position := line.find(ZERO + height)) != -1:
+            nearest = min(nearest, position)
+        by_height[height] = nearest
+    return by_height
+
+
+def summarize_columns_from_top(forest: ForestFile, tile: Tile) -> array:
+    """Per column of the tile, the first row holding a tree at least as tall as every height."""
+    cells = read_tile(forest, tile)
+    summary = array('H')
+    for j in range(tile.width):
+        summary.extend(first_at_least(cells[j::tile.width]))
+    return summary
+
+
+def summarize_tile(forest: ForestFile, tile: Tile) -> TileSummary:
+    cells = read_tile(forest, tile)
+    summary = TileSummary(array('H'), array('H'), array('H'))
+    for i in range(tile.height):
+        row = cells[i * tile.width:(i + 1) * tile.width]
+        summary.row_last.extend(last_at_least(row))
+        summary.row_first.extend(first_at_least(row))
+    for j in range(tile.width):
+        summary.column_last.extend(last_at_least(cells[j::tile.width]))
+    return summary
+
+
+def fold_nearer(nearer: array, origin: int, further: array) -> array:
+    """Per height, the position from the nearer tile (relative to origin) if it has one."""
+    return array('I', (
+        origin + position if position != NOWHERE_IN_TILE else fallback
+        for position, fallback in zip(nearer, further)))
+
+
+def fold_along_strip(summaries: Sequence[array], origins: Sequence[int], size: int) -> List[array]:
+    """State before every tile, coming from the first of them."""
+    state = array('I', [NOWHERE]) * size
+    states = []
+    for summary, origin in zip(summaries, origins):
+        states.append(state)
+        state = fold_nearer(summary, origin, state)
+    return states
+
+
+def seed_stack(nearest: Sequence[int], edge: int) -> Tuple[List[int], List[int]]:
+    """The monotonic stack a sweep from the edge would have left behind, given the nearest tree of every
+    height. A tree is only on it if no taller tree is nearer."""
+    positions, heights = [edge], [EDGE]
+    for height in reversed(range(HEIGHTS)):
+        position = nearest[height]
+        if position != NOWHERE and (height == HEIGHTS - 1 or position != nearest[height + 1]):
+            positions.append(position)
+            heights.append(ZERO + height)
+    return positions, heights
+
+
+def sweep(
+        line: bytes, offset: int, backwards: bool, stack: Tuple[List[int], List[int]],
+        flat_indices: range, scores: array, visible: bytearray) -> None:
+    """solve08.multiply_viewing_distances on a piece of a row or column, starting from a seeded stack."""
+    positions, heights = stack
+    for k in (reversed(range(len(line))) if backwards else range(len(line))):
+        height = line[k]
+        while heights[-1] < height:
+            positions.pop()
+            heights.pop()
+        index = flat_indices[k]
+        scores[index] *= abs(offset + k - positions[-1])
+        if len(heights) == 1:
+            visible[index] = 1
+        positions.append(offset + k)
+        heights.append(height)
+
+
+def solve_tile(
+        forest: ForestFile, tile: Tile, from_left: array, from_right: array, from_top: array,
+        from_bottom: array) -> Tuple[int, int]:
+    """Number of visible trees and best scenic score within the tile."""
+    cells = read_tile(forest, tile)
+    scores = array('Q', [1]) * len(cells)
+    visible = bytearray(len(cells))
+
+    for i in range(tile.height):
+        row = cells[i * tile.width:(i + 1) * tile.width]
+        flat_indices = range(i * tile.width, (i + 1) * tile.width)
+        boundary = slice(i * HEIGHTS, (i + 1) * HEIGHTS)
+        left_stack = seed_stack(from_left[boundary], 0)
+        right_stack = seed_stack(from_right[boundary], forest.width - 1)
+        sweep(row, tile.left, False, left_stack, flat_indices, scores, visible)
+        sweep(row, tile.left, True, right_stack, flat_indices, scores, visible)
+    for j in range(tile.width):
+        column = cells[j::tile.width]
+        flat_indices = range(j, len(cells), tile.width)
+        boundary = slice(j * HEIGHTS, (j + 1) * HEIGHTS)
+        top_stack = seed_stack(from_top[boundary], 0)
+        bottom_stack = seed_stack(from_bottom[boundary], forest.height - 1)
+        sweep(column, tile.top, False, top_stack, flat_indices, scores, visible)
+        sweep(column, tile.top, True, bottom_stack, flat_indices, scores, visible)
+
+    return visible.count(1), max(scores)
+
+
+def map_bounded(
+        executor: Optional[ProcessPoolExecutor], function: Callable, arguments: Iterable[Tuple],
+        window: int) -> Iterator[Any]:
+    """Like executor.map, but with at most window tasks, and so their arguments, in flight at a time."""
+    if executor is None:
+        for task_arguments in arguments:
+            yield function(*task_arguments)
+        return
+
+    pending: Deque[Future] = deque()
+    for task_arguments in arguments:
+        pending.append(executor.submit(function, *task_arguments))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def spill_states_from_bottom(
+        forest: ForestFile, tile_size: int, executor: Optional[ProcessPoolExecutor], window: int,
+        spill: BinaryIO) -> None:
+    """Writes, strip by strip from the top, what lies below each strip: HEIGHTS rows per column."""
+    strip_tops = range(0, forest.height, tile_size)
+    state = array('I', [NOWHERE]) * (forest.width * HEIGHTS)
+    states_size = len(state) * state.itemsize
+    for strip_number, top in reversed(list(enumerate(strip_tops))):
+        spill.seek(strip_number * states_size)
+        state.tofile(spill)
+        tiles = list(iter_strip(forest, top, tile_size))
+        summaries = map_bounded(
+            executor, summarize_columns_from_top, ((forest, tile) for tile in tiles), window)
+        for tile, summary in zip(tiles, summaries):
+            columns = slice(tile.left * HEIGHTS, tile.right * HEIGHTS)
+            state[columns] = fold_nearer(summary, tile.top, state[columns])
+
+
+def read_spilled_states(spill: BinaryIO, strip_number: int, size: int) -> array:
+    states = array('I')
+    spill.seek(strip_number * size * states.itemsize)
+    states.fromfile(spill, size)
+    return states
+
+
+def solve_file(file_name: str, tile_size: int = TILE_SIZE, jobs: int = 1) -> Tuple[int, int]:
+    """Both answers of day 8, holding a tile per worker and one strip of tile boundaries in memory."""
+    if not 0 < tile_size < NOWHERE_IN_TILE:
+        raise SystemError(f'tile_size must be below {NOWHERE_IN_TILE}')
+    forest = ForestFile.open(file_name)
+    if max(forest.height, forest.width) >= NOWHERE:
+        raise SystemError(f'{file_name} is too large for 32 bit positions')
+
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    window = TASKS_PER_WORKER * jobs
+    visible_count, best_score = 0, 0
+    try:
+        with tempfile.TemporaryFile() as spill:
+            spill_states_from_bottom(forest, tile_size, executor, window, spill)
+
+            from_top = array('I', [NOWHERE]) * (forest.width * HEIGHTS)
+            for strip_number, top in enumerate(range(0, forest.height, tile_size)):
+                from_bottom = read_spilled_states(spill, strip_number, len(from_top))
+                tiles = list(iter_strip(forest, top, tile_size))
+                summaries = list(map_bounded(executor, summarize_tile, ((forest, tile) for tile in tiles), window))
+
+                size = tiles[0].height * HEIGHTS
+                lefts = [tile.left for tile in tiles]
+                from_left = fold_along_strip([summary.row_last for summary in summaries], lefts, size)
+                from_right = fold_along_strip(
+                    [summary.row_first for summary in reversed(summaries)], lefts[::-1], size)[::-1]
+
+                tasks = (
+                    (forest, tile, from_left[t], from_right[t],
+                     from_top[tile.left * HEIGHTS:tile.right * HEIGHTS],
+                     from_bottom[tile.left * HEIGHTS:tile.right * HEIGHTS])
+                    for t, tile in enumerate(tiles))
+                for count, score in map_bounded(executor, solve_tile, tasks, window):
+                    visible_count += count
+                    best_score = max(best_score, score)
+
+                for tile, summary in zip(tiles, summaries):
+                    columns = slice(tile.left * HEIGHTS, tile.right * HEIGHTS)
+                    from_top[columns] = fold_nearer(summary.column_last, tile.top, from_top[columns])
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return visible_count, best_score
+
+
+if __name__ == '__main__':
+    visible_count, best_score = solve_file('day08/input.txt', tile_size=32)
+    print('part1', visible_count)
+    print('part2', best_score)
@@ -1,7 +1,8 @@
+from array import array
 from dataclasses import dataclass
-from typing import List
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from utils import Point2D, read_file
+from utils import Point2D, pack, pack_delta, profiling, read_file
 
 
 DIRECTIONS = {
@@ -23,7 +24,7 @@ class Move:
         return Move(DIRECTIONS[direction], int(amount))
 
     @classmethod
-    def from_input_lines(cls, lines: List[str]) -> List['Move']:
+    def from_input_lines(cls, lines: Iterable[str]) -> List['Move']:
         return [Move.from_input_line(line) for line in lines]
 
 
@@ -49,6 +50,7 @@ class Rope:
     def _squish_point(self, point: Point2D) -> Point2D:
         return Point2D(self._squish_number(point.i), self._squish_number(point.j))
 
+    @profiling.counted('Rope.pull')
     def pull(self, direction: Point2D) -> None:
         self.knots[0] += direction
         for i_prev_moved, i_cur in zip(range(0, len(self.knots)), range(1, len(self.knots))):
@@ -57,27 +59,151 @@ class Rope:
 
 
 def count_tail_positions_of_rope(rope: Rope, moves: List[Move]) -> int:
-    visited_by_tail = {rope.tail}
+    visited_by_tail = {rope.tail.packed()}
     for move in moves:
         for _ in range(move.amount):
             rope.pull(move.direction)
-            visited_by_tail.add(rope.tail)
+            visited_by_tail.add(rope.tail.packed())
 
     return len(visited_by_tail)
 
 
-def part_1(lines: List[str]) -> int:
-    return count_tail_positions_of_rope(
-        Rope(2),
-        Move.from_input_lines(lines))
+class FlatRope:
+    """Rope with its knots in two flat lists of coordinates and the visited positions as packed ints.
+
+    A step stops at the first knot that is still touching its predecessor, nothing behind it moves. Once a
+    step has moved every knot exactly like the head, the rope is trailing straight behind it and every
+    further step of the move repeats that, so the rest of the move is applied in one go.
+
+    Knot k follows exactly the path the tail of a rope of k + 1 knots would, so with track_all_knots,
+    visited[k] answers that rope too; otherwise only the tail's visits are kept. on_trajectory (which
+    implies track_all_knots) is called after every move, once per knot that moved, with the packed
+    positions the knot stepped through in order. All knots start at the origin. Only the current move's
+    positions are ever buffered.
+    """
+
+    def __init__(
+            self, size: int, track_all_knots: bool = False,
+            on_trajectory: Optional[Callable[[int, array], None]] = None) -> None:
+        self.rows = [0] * size
+        self.columns = [0] * size
+        self.track_all_knots = track_all_knots or on_trajectory is not None
+        self.visited: List[Set[int]] = [{pack(0, 0)} for _ in range(size)]
+        self.on_trajectory = on_trajectory
+        self._trajectories: Optional[List[array]] = None
+        if on_trajectory is not None:
+            self._trajectories = [array('Q') for _ in range(size)]
+
+    @property
+    def visited_by_tail(self) -> Set[int]:
+        return self.visited[-1]
+
+    def _record(self, k: int) -> None:
+        position = pack(self.rows[k], self.columns[k])
+        self.visited[k].add(position)
+        if self._trajectories is not None:
+            self._trajectories[k].append(position)
+
+    def apply(self, move: Move) -> None:
+        self._apply_steps(move)
+        if self.on_trajectory is not None and self._trajectories is not None:
+            for k, positions in enumerate(self._trajectories):
+                if positions:
+                    self.on_trajectory(k, positions)
+                    self._trajectories[k] = array('Q')
+
+    def _apply_steps(self, move: Move) -> None:
+        di, dj = move.direction.i, move.direction.j
+        rows, columns = self.rows, self.columns
+        track_all_knots, tail = self.track_all_knots, len(rows) - 1
+        if profiling.ENABLED:
+            profiling.count('FlatRope.steps', move.amount)
+
+        for step in range(move.amount):
+            rows[0] += di
+            columns[0] += dj
+            if track_all_knots:
+                self._record(0)
+            moved_like_head = True
+            for k in range(1, len(rows)):
+                d_row, d_column = rows[k - 1] - rows[k], columns[k - 1] - columns[k]
+                if -1 <= d_row <= 1 and -1 <= d_column <= 1:
+                    break
+                step_row, step_column = (d_row > 0) - (d_row < 0), (d_column > 0) - (d_column < 0)
+                rows[k] += step_row
+                columns[k] += step_column
+                if track_all_knots:
+                    self._record(k)
+                moved_like_head = moved_like_head and step_row == di and step_column == dj
+            else:
+                if not track_all_knots:
+                    self._record(tail)
+                if moved_like_head:
+                    self._apply_straight(di, dj, move.amount - step - 1)
+                    return
+
+    def _apply_straight(self, di: int, dj: int, amount: int) -> None:
+        rows, columns = self.rows, self.columns
+        delta = pack_delta(di, dj)
+        if profiling.ENABLED:
+            profiling.count('FlatRope.straight_steps', amount)
+        for k in range(len(rows)):
+            if self.track_all_knots or k == len(rows) - 1:
+                position = pack(rows[k], columns[k])
+                path = range(position + delta, position + (amount + 1) * delta, delta)
+                self.visited[k].update(path)
+                if self._trajectories is not None:
+                    self._trajectories[k].extend(path)
+            rows[k] += amount * di
+            columns[k] += amount * dj
+
+
+def trajectory_writer(stream: BinaryIO) -> Callable[[int, array], None]:
+    """on_trajectory that appends every piece to stream as its knot and length, then its packed positions,
+    all native unsigned 64 bit ints."""
+    def write(knot: int, positions: array) -> None:
+        array('Q', [knot, len(positions)]).tofile(stream)
+        positions.tofile(stream)
+    return write
+
+
+def read_trajectories(stream: BinaryIO) -> Iterator[Tuple[int, array]]:
+    """(knot, packed positions) pieces in the order trajectory_writer wrote them."""
+    while header_bytes := stream.read(16):
+        header = array('Q', header_bytes)
+        positions = array('Q')
+        positions.fromfile(stream, header[1])
+        yield header[0], positions
+
+
+def simulate(
+        size: int, moves: Iterable[Move], track_all_knots: bool = False,
+        on_trajectory: Optional[Callable[[int, array], None]] = None) -> FlatRope:
+    rope = FlatRope(size, track_all_knots, on_trajectory)
+    for move in moves:
+        rope.apply(move)
+    return rope
+
+
+def count_tail_positions(size: int, moves: Iterable[Move]) -> int:
+    return len(simulate(size, moves).visited_by_tail)
+
+
+def count_tail_positions_by_length(max_size: int, moves: Iterable[Move]) -> Dict[int, int]:
+    """Positions visited by the tail of every rope of 1 up to max_size knots, from one simulation."""
+    rope = simulate(max_size, moves, track_all_knots=True)
+    return {k + 1: len(visited) for k, visited in enumerate(rope.visited)}
+
+
+def part_1(lines: Iterable[str]) -> int:
+    return count_tail_positions(2, Move.from_input_lines(lines))
 
 
-def part_2(lines: List[str]) -> int:
-    return count_tail_positions_of_rope(
-        Rope(10),
-        Move.from_input_lines(lines))
+def part_2(lines: Iterable[str]) -> int:
+    return count_tail_positions(10, Move.from_input_lines(lines))
 
 
-lines = read_file('day09/input.txt')
-print('part1', part_1(lines))
-print('part2', part_2(lines))
+if __name__ == '__main__':
+    lines = read_file('day09/input.txt')
+    print('part1', part_1(lines))
+    print('part2', part_2(lines))
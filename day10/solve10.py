@@ -1,8 +1,8 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
-from utils import divide_into_chunks, read_file
+from utils import divide_into_chunks, profiling, read_file
 
 
 class OpName(Enum):
@@ -37,6 +37,7 @@ class CPU:
         self.current_operation: Optional[Operation] = Operation(1, OpName.NOOP, 0)
         self.last_drawn_char = '.'
 
+    @profiling.counted('CPU.tick')
     def tick(self) -> bool:
         if not self.current_operation:
             return False
@@ -63,7 +64,7 @@ def calculate_signal_strength(cpu: CPU) -> int:
     return cpu.clock * cpu.register_x
 
 
-def part_1(lines: List[str]) -> int:
+def part_1(lines: Iterable[str]) -> int:
     cpu = CPU([Operation.from_line(line) for line in lines])
     signal_strength = 0
 
@@ -81,7 +82,7 @@ def get_last_drawn(cpu: CPU) -> str:
     return '.'
 
 
-def part_2(lines: List[str]) -> str:
+def part_2(lines: Iterable[str]) -> str:
     cpu = CPU([Operation.from_line(line) for line in lines])
 
     chars: List[str] = []
@@ -92,9 +93,10 @@ def part_2(lines: List[str]) -> str:
     return '\n'.join([''.join(row) for row in rows])
 
 
-lines = read_file('day10/input.txt')
-print('part1', part_1(lines))
-print('part2', part_2(lines), sep=':\n')
+if __name__ == '__main__':
+    lines = read_file('day10/input.txt')
+    print('part1', part_1(lines))
+    print('part2', part_2(lines), sep=':\n')
 
 """
 
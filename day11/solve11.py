@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
-from typing import Callable, ClassVar, Dict, List, Set
+from typing import Callable, ClassVar, Dict, List, Sequence, Set
 
-from utils import divide_into_chunks, read_file
+from utils import profiling, read_file, stride_records
 
 import math
 import re
@@ -29,11 +29,11 @@ class Monka:
     num_items_processed: int = field(init=False, default=0)
 
     @classmethod
-    def bad_monka(cls, chunk: List[str]) -> None:
+    def bad_monka(cls, chunk: Sequence[str]) -> None:
         raise SyntaxError(f'Bad Monka. {chunk}')
 
     @classmethod
-    def validate(cls, chunk: List[str]) -> None:
+    def validate(cls, chunk: Sequence[str]) -> None:
         if not (chunk[0].startswith('Monkey ') and
                 chunk[1].startswith('  Starting items:') and
                 chunk[2].startswith('  Operation: ') and
@@ -49,7 +49,7 @@ class Monka:
         raise SystemError(f'elp: {line}')
 
     @classmethod
-    def from_monka_chunk(cls, chunk: List[str]) -> 'Monka':
+    def from_monka_chunk(cls, chunk: Sequence[str]) -> 'Monka':
         """Expects chunk size of at least 6. All later items after index 5 in chunk are ignored"""
         cls.validate(chunk)
 
@@ -68,12 +68,14 @@ class Monka:
         self.num_items_processed = 0
 
     # empty items, and report result
+    @profiling.timed('Monka.process_items')
     def process_items(self, worry_function: Callable[[int], int]) -> Dict[int, List[int]]:
         monkas_to_items: Dict[int, List[int]] = {
             self.test.pass_id: [],
             self.test.fail_id: []
         }
 
+        profiling.count('Monka.process_items.items', len(self.items))
         for item in self.items:
             next_value = worry_function(self.process_item(item))
             monkas_to_items[self.test.run(next_value)].append(next_value)
@@ -90,9 +92,8 @@ class Monka:
         self.items.extend(items)
 
 
-def instantiate_monkas(lines: List[str]) -> Dict[int, Monka]:
-    monka_chunks = divide_into_chunks(lines, 7)
-    monkas = [Monka.from_monka_chunk(chunk) for chunk in monka_chunks]
+def parse(lines: List[str]) -> Dict[int, Monka]:
+    monkas = [Monka.from_monka_chunk(chunk) for chunk in stride_records(lines, 7)]
     return {monka.id: monka for monka in monkas}
 
 
@@ -103,8 +104,8 @@ def play_round(monkas: Dict[int, Monka], worry_function: Callable[[int], int]) -
             monkas[monka_id].receive_items(items)
 
 
-def part_1(lines: List[str]) -> int:
-    monkas = instantiate_monkas(lines)
+# The parts move items between the parsed monkas, parse again for every part
+def part_1(monkas: Dict[int, Monka]) -> int:
 
     for _ in range(20):
         play_round(monkas, lambda x: x//3)
@@ -119,16 +120,19 @@ def get_prime_factors(number: int) -> Set[int]:
         factors.add(2)
         number //= 2
 
-    for i in range(3, int(math.sqrt(number)) + 1, 2):
+    i = 3
+    while i * i <= number:
         while (number % i == 0):
             factors.add(i)
             number //= i
+        i += 2
 
+    if number > 1:
+        factors.add(number)
     return factors
 
 
-def part_2(lines: List[str]) -> int:
-    monkas = instantiate_monkas(lines)
+def part_2(monkas: Dict[int, Monka]) -> int:
     primes = get_prime_factors(math.prod(monka.test.divisible_by for monka in monkas.values()))
     mod = math.prod(primes)
 
@@ -139,6 +143,7 @@ def part_2(lines: List[str]) -> int:
     return sorted_monkas[0].num_items_processed * sorted_monkas[1].num_items_processed
 
 
-lines = read_file('day11/input.txt')
-print('part1', part_1(lines))  # type: ignore
-print('part2', part_2(lines))  # type: ignore
+if __name__ == '__main__':
+    lines = read_file('day11/input.txt')
+    print('part1', part_1(parse(lines)))  # type: ignore
+    print('part2', part_2(parse(lines)))  # type: ignore
@@ -1,93 +1,59 @@
 from collections import deque
-from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List
 
-from utils import Point2D, read_file
+from utils import Grid, profiling, read_file
 
 
-class Grid:
-    directions = [Point2D(1, 0), Point2D(0, 1), Point2D(-1, 0), Point2D(0, -1)]
+def parse(lines: List[str]) -> Grid:
+    return Grid.from_lines(lines)
 
-    def __init__(self, matrix: List[str]) -> None:
-        self.matrix: List[List[str]] = [[char for char in row] for row in matrix]
-        self.I, self.J = len(matrix), len(matrix[0])
 
-    def __getitem__(self, point: Point2D) -> str:
-        return self.matrix[point.i][point.j]
+def find_start_and_end(grid: Grid) -> List[int]:
+    """Replaces S and E with the heights they stand for"""
+    start_point, end_point = grid.find_all(ord('S'))[0], grid.find_all(ord('E'))[0]
+    grid[start_point], grid[end_point] = ord('a'), ord('z')
+    return [start_point, end_point]
 
-    def __setitem__(self, point: Point2D, value: str) -> None:
-        self.matrix[point.i][point.j] = value
 
-    def contains_coordinate(self, point: Point2D) -> bool:
-        return (
-            (0 <= point.i < self.I) and
-            (0 <= point.j < self.J))
-
-    def neighboring_coordinates(self, point: Point2D) -> List[Point2D]:
-        all_neighbors = (point + direction for direction in self.directions)
-        return [neighbor for neighbor in all_neighbors if self.contains_coordinate(neighbor)]
-
-    def find_all_points(self, key: str) -> List[Point2D]:
-        return [Point2D(i, j) for i, row in enumerate(self.matrix) for j, char in enumerate(row) if char == key]
-
-    def __str__(self) -> str:
-        return '\n'.join([''.join(row) for row in self.matrix])
-
-
-@dataclass
-class QItem:
-    coordinates: Point2D
-    distance: int
-    parent: Optional['QItem'] = field(default=None)
-
-    def __hash__(self) -> int:
-        return hash(self.coordinates)
-
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, QItem):
-            return False
-        return (self is other) or (self.coordinates == other.coordinates)
-
-
-def valid_transition(char_from: str, char_to: str) -> bool:
-    return ord(char_from) - ord(char_to) > -2
-
-
-def find_distance(grid: Grid, starting_items: List[QItem], target_point: Point2D) -> int:
-    seen_items = set(starting_items)
-    Q: deque[QItem] = deque(starting_items)
+# The padding around the grid is higher than any height, so it is never a valid transition
+@profiling.timed('find_distance')
+def find_distance(grid: Grid, starting_points: List[int], target_point: int) -> int:
+    cells, offsets = grid.cells, grid.orthogonal_offsets
+    distances = [-1] * len(cells)
+    for point in starting_points:
+        distances[point] = 0
+    Q: deque[int] = deque(starting_points)
 
     while Q:
-        item = Q.popleft()
-        if item.coordinates == target_point:
+        point = Q.popleft()
+        if point == target_point:
             break
 
-        for coords in grid.neighboring_coordinates(item.coordinates):
-            next_item = QItem(coords, item.distance + 1, item)
-            if (valid_transition(grid[item.coordinates], grid[next_item.coordinates]) and next_item not in seen_items):
-                seen_items.add(next_item)
-                Q.append(next_item)
-
-    if item.coordinates != target_point:
-        return -1
-    return item.distance
+        highest_reachable = cells[point] + 1
+        next_distance = distances[point] + 1
+        for offset in offsets:
+            neighbor = point + offset
+            if distances[neighbor] == -1 and cells[neighbor] <= highest_reachable:
+                distances[neighbor] = next_distance
+                Q.append(neighbor)
 
+    if profiling.ENABLED:
+        profiling.count('find_distance.visited', len(distances) - distances.count(-1))
+    return distances[target_point]
 
-def part_1(lines: List[str]) -> int:
-    grid = Grid(lines)
-    start_point, end_point = grid.find_all_points('S')[0], grid.find_all_points('E')[0]
-    grid[start_point], grid[end_point] = 'a', 'z'
-    return find_distance(grid, [QItem(start_point, 0)], end_point)
 
+# find_start_and_end writes into the grid, parse again for every part
+def part_1(grid: Grid) -> int:
+    start_point, end_point = find_start_and_end(grid)
+    return find_distance(grid, [start_point], end_point)
 
-def part_2(lines: List[str]) -> int:
-    grid = Grid(lines)
-    start_point, end_point = grid.find_all_points('S')[0], grid.find_all_points('E')[0]
-    grid[start_point], grid[end_point] = 'a', 'z'
 
-    return find_distance(grid, [QItem(point, 0) for point in grid.find_all_points('a')], end_point)
+def part_2(grid: Grid) -> int:
+    _, end_point = find_start_and_end(grid)
+    return find_distance(grid, grid.find_all(ord('a')), end_point)
 
 
-lines = read_file('day12/input.txt')
-print('part2', part_1(lines))  # type: ignore
-print('part1', part_2(lines))  # type: ignore
+if __name__ == '__main__':
+    lines = read_file('day12/input.txt')
+    print('part2', part_1(parse(lines)))  # type: ignore
+    print('part1', part_2(parse(lines)))  # type: ignore
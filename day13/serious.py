@@ -1,6 +1,6 @@
 from typing import List, Union
 
-from utils import read_file, divide_into_chunks
+from utils import read_file, stride_records
 from functools import cmp_to_key
 
 import json
@@ -31,23 +31,25 @@ def compare(left: Union[int, list], right: Union[int, list]) -> int:
     raise SystemError('wopsie')
 
 
-def part_1(lines: List[str]) -> int:
-    tests = divide_into_chunks(lines, 3)
-    package_tuples = ((json.loads(t[0]), json.loads(t[1])) for t in tests)
+def parse(lines: List[str]) -> List[list]:
+    return [json.loads(line) for line in lines if line != '']
+
+
+def part_1(packages: List[list]) -> int:
     return sum(i
-               for i, [left, right] in enumerate(package_tuples, 1)
+               for i, [left, right] in enumerate(stride_records(packages, 2), 1)
                if compare(left, right) == -1)
 
 
-def part_2(lines: List[str]) -> int:
+def part_2(packages_unordered: List[list]) -> int:
     dividers = [json.loads("[[2]]"), json.loads("[[6]]")]
-    packages_unordered = [json.loads(line) for line in lines if line != '']
     packages_ordered = list(sorted(dividers + packages_unordered, key=cmp_to_key(compare)))
 
     return math.prod([i for i, package in enumerate(packages_ordered, 1) if package in dividers])
 
 
-lines = read_file('day13/input.txt')
-tests = divide_into_chunks(lines, 3)
-print('part1', part_1(lines))
-print('part2', part_2(lines))
+if __name__ == '__main__':
+    lines = read_file('day13/input.txt')
+    packages = parse(lines)
+    print('part1', part_1(packages))
+    print('part2', part_2(packages))
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import List, Union
 
-from utils import read_file, divide_into_chunks
+from utils import read_file, stride_records
 
 
 @dataclass
@@ -95,16 +95,18 @@ class NestedList:
         return cls._from_reverse_tokens(reversed_tokens)
 
 
-def part_1(lines: List[str]) -> int:
-    tests = divide_into_chunks(lines, 3)
-    package_tuples = ((NestedList.parse_str(t[0]), NestedList.parse_str(t[1])) for t in tests)
+def parse(lines: List[str]) -> List[NestedList]:
+    return [NestedList.parse_str(line) for line in lines if line != '']
+
+
+def part_1(packages: List[NestedList]) -> int:
     return sum(i
-               for i, [left, right] in enumerate(package_tuples, 1)
+               for i, [left, right] in enumerate(stride_records(packages, 2), 1)
                if left < right)
 
 
-def part_2(lines: List[str]) -> int:
-    packages = list(sorted([NestedList.parse_str(line) for line in lines if line != '']))
+def part_2(packages_unordered: List[NestedList]) -> int:
+    packages = list(sorted(packages_unordered))
     divider_1 = NestedList.parse_str("[[2]]")
     divider_2 = NestedList.parse_str("[[6]]")
 
@@ -113,7 +115,9 @@ def part_2(lines: List[str]) -> int:
         (len([p for p in packages if p < divider_2]) + 2))
 
 
-lines = read_file('day13/input.txt')
+if __name__ == '__main__':
+    lines = read_file('day13/input.txt')
 
-print('part1', part_1(lines))
-print('part2', part_2(lines))
+    packages = parse(lines)
+    print('part1', part_1(packages))
+    print('part2', part_2(packages))
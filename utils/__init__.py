@@ -1,11 +1,10 @@
 from typing import List
 
-from .point2d import Point2D
-
-
-def read_file(file_name: str) -> List[str]:
-    with open(file_name, 'r') as inpfile:
-        return inpfile.read().splitlines()
+from . import profiling
+from .grid import Grid
+from .point2d import Point2D, pack, pack_delta, unpack
+from .reader import byte_block_bounds, iter_byte_blocks, iter_byte_lines, iter_lines, read_byte_range, read_file
+from .records import RecordView, blank_separated_bounds, blank_separated_records, stride_bounds, stride_records
 
 
 def divide_into_chunks(items: List, chunk_size: int) -> List[List]:
@@ -14,4 +13,8 @@ def divide_into_chunks(items: List, chunk_size: int) -> List[List]:
         for i in range(0, len(items), chunk_size)]
 
 
-__all__ = ['Point2D']
+__all__ = [
+    'Grid', 'Point2D', 'RecordView', 'profiling',
+    'blank_separated_bounds', 'blank_separated_records', 'stride_bounds', 'stride_records',
+    'byte_block_bounds', 'iter_byte_blocks', 'iter_byte_lines', 'iter_lines', 'read_byte_range', 'read_file',
+    'pack', 'pack_delta', 'unpack']
@@ -0,0 +1,100 @@
+from functools import lru_cache
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Optional
+
+from .reader import iter_byte_blocks
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import zlib
+
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+
+def file_digest(file_name: str) -> str:
+    stat = os.stat(file_name)
+    return _file_digest(os.path.abspath(file_name), stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=None)
+def _file_digest(file_name: str, size: int, mtime_ns: int) -> str:
+    """size and mtime_ns are only there so that an edited file is hashed again"""
+    digest = hashlib.blake2b(digest_size=20)
+    for block in iter_byte_blocks(file_name):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+def module_digest(module: ModuleType) -> str:
+    """Changes whenever the solver's source file does."""
+    if module.__file__ is None:
+        raise SystemError(f'{module.__name__} has no source file to hash')
+    return file_digest(module.__file__)
+
+
+def make_key(*parts: str) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f'python{sys.version_info.major}.{sys.version_info.minor}'.encode())
+    for part in parts:
+        digest.update(b'\0' + part.encode())
+    return digest.hexdigest()
+
+
+class Cache:
+    """Content addressed store of zlib compressed pickles, evicting least recently used entries
+    once the directory grows past max_bytes."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f'{key}.pickle.zz'
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # last access time for eviction
+        except FileNotFoundError:
+            return default
+        return pickle.loads(zlib.decompress(data))
+
+    def put(self, key: str, value: Any) -> None:
+        """Values that can not be pickled (or are nested too deeply to) are silently not cached."""
+        try:
+            data = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), level=1)
+        except (pickle.PicklingError, RecursionError, TypeError, AttributeError):
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # written to the side and renamed, so concurrent workers never see half a file
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_name, path)
+        self.evict()
+
+    def evict(self, max_bytes: Optional[int] = None) -> None:
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = []
+        for path in self.directory.glob('*/*.pickle.zz'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # evicted by another worker
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= limit:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
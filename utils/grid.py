@@ -0,0 +1,111 @@
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+
+OUTSIDE = 0xff
+
+
+class Grid:
+    """Row-major byte grid stored in one flat bytearray, surrounded by `padding` cells of pad_value.
+
+    Cells are addressed by flat index. Adding one of the precomputed offsets to the index of any real cell
+    gives the index of its neighbour, and thanks to the padding that neighbour always exists, so hot loops
+    never need bounds checks: stepping outside simply lands on pad_value.
+    """
+
+    def __init__(self, height: int, width: int, cells: bytearray, padding: int = 1) -> None:
+        self.height, self.width, self.padding = height, width, padding
+        self.stride = width + 2 * padding
+        if len(cells) != self.stride * (height + 2 * padding):
+            raise SystemError(f'{len(cells)} cells do not make a padded {height}x{width} grid')
+        self.cells = cells
+
+        stride = self.stride
+        self.orthogonal_offsets: Tuple[int, ...] = (-stride, 1, stride, -1)
+        self.diagonal_offsets: Tuple[int, ...] = (-stride - 1, -stride + 1, stride + 1, stride - 1)
+        self.all_offsets: Tuple[int, ...] = self.orthogonal_offsets + self.diagonal_offsets
+
+    @classmethod
+    def from_lines(
+            cls, lines: Iterable[Union[str, bytes]], translation: Optional[bytes] = None,
+            pad_value: int = OUTSIDE, padding: int = 1) -> 'Grid':
+        """translation is a bytes.maketrans table applied to every row, e.g. to turn digits into numbers."""
+        rows = [line.encode() if isinstance(line, str) else line for line in lines]
+        if translation is not None:
+            rows = [row.translate(translation) for row in rows]
+
+        height, width = len(rows), len(rows[0]) if rows else 0
+        if any(len(row) != width for row in rows):
+            raise SystemError('rows of a grid must all have the same length')
+
+        side_padding = bytes([pad_value]) * padding
+        padding_rows = bytes([pad_value]) * ((width + 2 * padding) * padding)
+        cells = bytearray(padding_rows)
+        for row in rows:
+            cells += side_padding
+            cells += row
+            cells += side_padding
+        cells += padding_rows
+        return cls(height, width, cells, padding)
+
+    def index(self, i: int, j: int) -> int:
+        return (i + self.padding) * self.stride + j + self.padding
+
+    def coordinates(self, index: int) -> Tuple[int, int]:
+        i, j = divmod(index, self.stride)
+        return i - self.padding, j - self.padding
+
+    def __getitem__(self, index: int) -> int:
+        return self.cells[index]
+
+    def __setitem__(self, index: int, value: int) -> None:
+        self.cells[index] = value
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def is_inside(self, index: int) -> bool:
+        i, j = self.coordinates(index)
+        return 0 <= i < self.height and 0 <= j < self.width
+
+    def row_indices(self, i: int) -> range:
+        start = self.index(i, 0)
+        return range(start, start + self.width)
+
+    def column_indices(self, j: int) -> range:
+        start = self.index(0, j)
+        return range(start, start + self.height * self.stride, self.stride)
+
+    def ray_indices(self, i: int, j: int, offset: int) -> range:
+        """Indices from (i, j) walking by offset (any of the precomputed ones: along a row, a column or a
+        diagonal) up to the last cell before leaving the grid."""
+        di, dj = divmod(offset + self.stride // 2, self.stride)
+        dj -= self.stride // 2
+        steps = min(
+            (self.height - 1 - i) // di if di > 0 else (i // -di if di < 0 else self.height),
+            (self.width - 1 - j) // dj if dj > 0 else (j // -dj if dj < 0 else self.width))
+        start = self.index(i, j)
+        return range(start, start + (steps + 1) * offset, offset)
+
+    def inner_indices(self) -> Iterator[int]:
+        for i in range(self.height):
+            yield from self.row_indices(i)
+
+    def row(self, i: int) -> memoryview:
+        indices = self.row_indices(i)
+        return memoryview(self.cells)[indices.start:indices.stop]
+
+    def column(self, j: int) -> memoryview:
+        indices = self.column_indices(j)
+        return memoryview(self.cells)[indices.start:indices.stop:indices.step]
+
+    def find_all(self, value: int) -> List[int]:
+        """Indices of every real cell holding value, in row-major order."""
+        indices = []
+        index = self.cells.find(value)
+        while index != -1:
+            indices.append(index)
+            index = self.cells.find(value, index + 1)
+        return [index for index in indices if self.is_inside(index)]
+
+    def __str__(self) -> str:
+        return '\n'.join(self.row(i).tobytes().decode('latin-1') for i in range(self.height))
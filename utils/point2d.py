@@ -1,8 +1,29 @@
 from dataclasses import dataclass
+from typing import Tuple
+
+
+# Points packed into a single int, for hot loops and large sets of points. Both coordinates
+# must fit in [-PACK_OFFSET, PACK_OFFSET). Adding pack_delta(di, dj) to a packed point moves it.
+PACK_SHIFT = 32
+PACK_OFFSET = 1 << (PACK_SHIFT - 1)
+PACK_MASK = (1 << PACK_SHIFT) - 1
+
+
+def pack(i: int, j: int) -> int:
+    return ((i + PACK_OFFSET) << PACK_SHIFT) | (j + PACK_OFFSET)
+
+
+def unpack(packed: int) -> Tuple[int, int]:
+    return (packed >> PACK_SHIFT) - PACK_OFFSET, (packed & PACK_MASK) - PACK_OFFSET
+
+
+def pack_delta(di: int, dj: int) -> int:
+    return (di << PACK_SHIFT) + dj
 
 
 @dataclass
 class Point2D:
+    __slots__ = ('i', 'j')
     i: int
     j: int
 
@@ -36,3 +57,10 @@ class Point2D:
         return (
             (north_west.i <= self.i <= south_east.i) and
             (north_west.j <= self.j <= south_east.j))
+
+    def packed(self) -> int:
+        return pack(self.i, self.j)
+
+    @classmethod
+    def from_packed(cls, packed: int) -> 'Point2D':
+        return cls(*unpack(packed))
@@ -0,0 +1,122 @@
+"""Opt-in profiling hooks.
+
+Set AOC_PROFILE=1 (or call enable()) before the solvers are imported. When disabled, timed and counted
+return the decorated function untouched, section hands out a shared no-op context manager and count
+returns immediately, so the hooks can stay in the code.
+"""
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Callable, ContextManager, Dict, Iterator, Optional, TypeVar
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import time
+
+
+ENV_VARIABLE = 'AOC_PROFILE'
+ENABLED = bool(os.environ.get(ENV_VARIABLE))
+
+F = TypeVar('F', bound=Callable)
+
+
+@dataclass
+class Stats:
+    calls: int = 0
+    seconds: float = 0.0
+
+
+STATS: Dict[str, Stats] = {}
+_NULL_CONTEXT = nullcontext()
+
+
+def enable() -> None:
+    """Also exported to the environment, so worker processes pick it up."""
+    global ENABLED
+    ENABLED = True
+    os.environ[ENV_VARIABLE] = '1'
+
+
+def reset() -> None:
+    for stats in STATS.values():
+        stats.calls, stats.seconds = 0, 0.0
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    return {
+        name: {'calls': stats.calls, 'seconds': stats.seconds}
+        for name, stats in sorted(STATS.items())
+        if stats.calls}
+
+
+def count(name: str, amount: int = 1) -> None:
+    if not ENABLED:
+        return
+    STATS.setdefault(name, Stats()).calls += amount
+
+
+@contextmanager
+def _timed_section(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = STATS.setdefault(name, Stats())
+        stats.calls += 1
+        stats.seconds += time.perf_counter() - start
+
+
+def section(name: str) -> ContextManager[None]:
+    if not ENABLED:
+        return _NULL_CONTEXT
+    return _timed_section(name)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    def decorator(func: F) -> F:
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):  # type: ignore
+            with _timed_section(name):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore
+    return decorator
+
+
+def counted(name: str) -> Callable[[F], F]:
+    """Only counts calls, for functions too small to time."""
+    def decorator(func: F) -> F:
+        if not ENABLED:
+            return func
+
+        stats = STATS.setdefault(name, Stats())
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):  # type: ignore
+            stats.calls += 1
+            return func(*args, **kwargs)
+        return wrapper  # type: ignore
+    return decorator
+
+
+@contextmanager
+def cprofiled(output_path: Optional[str] = None) -> Iterator[cProfile.Profile]:
+    """Runs the block under cProfile and dumps the stats to output_path, if given."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if output_path:
+            profiler.dump_stats(output_path)
+
+
+def format_cprofile(profiler: cProfile.Profile, limit: int = 30) -> str:
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
+    return stream.getvalue()
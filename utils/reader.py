@@ -0,0 +1,68 @@
+from typing import Iterator, List, Tuple
+
+import mmap
+
+
+BLOCK_SIZE = 1 << 20
+
+
+def _block_bounds(buffer: mmap.mmap, block_size: int) -> Iterator[Tuple[int, int]]:
+    start, size = 0, len(buffer)
+    while start < size:
+        end = size
+        if start + block_size < size:
+            end = buffer.rfind(b'\n', start, start + block_size) + 1
+            if end <= start:  # a single line longer than a block
+                end = buffer.find(b'\n', start + block_size) + 1 or size
+        yield start, end
+        start = end
+
+
+def iter_byte_blocks(file_name: str, block_size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """Yields roughly block_size sized pieces of a memory mapped file, always cut right after a newline."""
+    with open(file_name, 'rb') as inpfile:
+        try:
+            buffer = mmap.mmap(inpfile.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files can not be mapped
+            return
+
+        with buffer:
+            for start, end in _block_bounds(buffer, block_size):
+                yield buffer[start:end]
+
+
+def byte_block_bounds(file_name: str, block_size: int = BLOCK_SIZE) -> List[Tuple[int, int]]:
+    """(start, end) offsets of the blocks iter_byte_blocks would yield, so that worker processes can each
+    read their own block with read_byte_range instead of being sent its contents."""
+    with open(file_name, 'rb') as inpfile:
+        try:
+            buffer = mmap.mmap(inpfile.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return []
+
+        with buffer:
+            return list(_block_bounds(buffer, block_size))
+
+
+def read_byte_range(file_name: str, start: int, end: int) -> bytes:
+    with open(file_name, 'rb') as inpfile:
+        inpfile.seek(start)
+        return inpfile.read(end - start)
+
+
+def iter_byte_lines(file_name: str, block_size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """Lazily yields undecoded lines without their line endings. At most one block is held in memory."""
+    for block in iter_byte_blocks(file_name, block_size):
+        yield from block.splitlines()
+
+
+def iter_lines(file_name: str, block_size: int = BLOCK_SIZE) -> Iterator[str]:
+    for block in iter_byte_blocks(file_name, block_size):
+        yield from block.decode().splitlines()
+
+
+def read_file(file_name: str) -> List[str]:
+    lines: List[str] = []
+    for block in iter_byte_blocks(file_name):
+        lines.extend(block.decode().splitlines())
+    return lines
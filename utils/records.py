@@ -0,0 +1,76 @@
+from typing import Iterable, Iterator, Sequence, Tuple, TypeVar, Union, overload
+
+
+T = TypeVar('T')
+
+
+class RecordView(Sequence[T]):
+    """Read-only window over items[start:end] that does not copy the items."""
+    __slots__ = ('items', 'start', 'end')
+
+    def __init__(self, items: Sequence[T], start: int, end: int) -> None:
+        self.items = items
+        self.start = start
+        self.end = end
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'RecordView[T]': ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, 'RecordView[T]']:
+        if isinstance(index, slice):
+            start, end, step = index.indices(len(self))
+            if step != 1:
+                raise SystemError('RecordView only supports contiguous slices')
+            return RecordView(self.items, self.start + start, self.start + max(start, end))
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.items[self.start + index]
+
+    def __iter__(self) -> Iterator[T]:
+        items = self.items
+        for i in range(self.start, self.end):
+            yield items[i]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+def stride_bounds(num_items: int, stride: int) -> Iterator[Tuple[int, int]]:
+    """(start, end) of consecutive records of `stride` items. The last one may be shorter."""
+    for start in range(0, num_items, stride):
+        yield start, min(start + stride, num_items)
+
+
+def blank_separated_bounds(lines: Iterable[str]) -> Iterator[Tuple[int, int]]:
+    """(start, end) of every run of non-empty lines. Works on streams, only the indices are kept."""
+    start = None
+    i = 0
+    for i, line in enumerate(lines):
+        if line:
+            if start is None:
+                start = i
+        elif start is not None:
+            yield start, i
+            start = None
+
+    if start is not None:
+        yield start, i + 1
+
+
+def stride_records(items: Sequence[T], stride: int) -> Iterator[RecordView[T]]:
+    for start, end in stride_bounds(len(items), stride):
+        yield RecordView(items, start, end)
+
+
+def blank_separated_records(lines: Sequence[str]) -> Iterator[RecordView[str]]:
+    for start, end in blank_separated_bounds(lines):
+        yield RecordView(lines, start, end)
@@ -0,0 +1,230 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils import profiling, read_file
+from utils.cache import DEFAULT_MAX_BYTES, Cache, file_digest, make_key, module_digest
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_INPUT = 'day{day}/input.txt'
+DEFAULT_CACHE_DIR = REPO_ROOT / '.cache'
+
+
+@dataclass
+class PartResult:
+    day: int
+    module: str
+    part: int
+    answer: str
+    parse_seconds: float
+    solve_seconds: float
+    sections: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    cached: str = ''  # '', 'parse' or 'answer'
+    variant: str = ''
+
+    @property
+    def label(self) -> str:
+        return f'{self.module}[{self.variant}]' if self.variant else self.module
+
+
+def parse_int_ranges(description: str) -> List[int]:
+    """'1-3,7' -> [1, 2, 3, 7]"""
+    numbers: List[int] = []
+    for item in description.split(','):
+        if '-' in item:
+            first, last = item.split('-')
+            numbers.extend(range(int(first), int(last) + 1))
+        elif item:
+            numbers.append(int(item))
+    return numbers
+
+
+def discover_solvers(day: int) -> List[ModuleType]:
+    """Every module in dayNN/ that defines part_1 or part_2 is a solver."""
+    day_dir = REPO_ROOT / f'day{day:02}'
+    modules = []
+    for script in sorted(day_dir.glob('*.py')):
+        module = importlib.import_module(f'{day_dir.name}.{script.stem}')
+        if hasattr(module, 'part_1') or hasattr(module, 'part_2'):
+            modules.append(module)
+    return modules
+
+
+def get_parser(module: ModuleType) -> Callable[[List[str]], Any]:
+    """Solvers may define parse(lines) to turn raw lines into the argument of their parts."""
+    return getattr(module, 'parse', lambda lines: lines)
+
+
+@dataclass
+class CacheOptions:
+    directory: str
+    max_bytes: int = DEFAULT_MAX_BYTES
+    answers: bool = False
+
+
+def parse_input(module: ModuleType, input_path: str, cache: Optional[Cache], cache_key: str) -> Tuple[Any, bool]:
+    """Returns the parsed input and whether it came from the cache."""
+    if cache is None or not hasattr(module, 'parse'):
+        return get_parser(module)(read_file(input_path)), False
+
+    if (parsed := cache.get(cache_key)) is not None:
+        return parsed, True
+    parsed = module.parse(read_file(input_path))
+    cache.put(cache_key, parsed)
+    return parsed, False
+
+
+def solver_name(part: int, variant: str = '') -> str:
+    """Variants are alternative implementations of a part, e.g. part_1_traced"""
+    return f'part_{part}_{variant}' if variant else f'part_{part}'
+
+
+def run_part(
+        day: int, module_name: str, part: int, input_path: str, cprofile_dir: Optional[str] = None,
+        cache_options: Optional[CacheOptions] = None, variant: str = '') -> PartResult:
+    """Takes names rather than objects so it can be shipped to worker processes cheaply.
+    Every worker reads (memory maps) the input file itself."""
+    module = importlib.import_module(module_name)
+    solve = getattr(module, solver_name(part, variant))
+    profiling.reset()
+
+    cache, parse_key, answer_key = None, '', ''
+    if cache_options:
+        cache = Cache(cache_options.directory, cache_options.max_bytes)
+        parse_key = make_key(file_digest(input_path), module_digest(module), 'parse')
+        answer_key = make_key(file_digest(input_path), module_digest(module), solver_name(part, variant))
+        if cache_options.answers and (answer := cache.get(answer_key)) is not None:
+            return PartResult(day, module_name, part, answer, 0.0, 0.0, cached='answer', variant=variant)
+
+    parse_start = time.perf_counter()
+    parsed, parse_was_cached = parse_input(module, input_path, cache, parse_key)
+    solve_start = time.perf_counter()
+    if cprofile_dir:
+        output_prefix = str(Path(cprofile_dir, f'{module_name}.{solver_name(part, variant)}'))
+        answer = solve_with_cprofile(solve, parsed, output_prefix)
+    else:
+        answer = solve(parsed)
+    solve_end = time.perf_counter()
+
+    if cache and cache_options and cache_options.answers:
+        cache.put(answer_key, str(answer))
+
+    return PartResult(
+        day=day,
+        module=module_name,
+        part=part,
+        answer=str(answer),
+        parse_seconds=solve_start - parse_start,
+        solve_seconds=solve_end - solve_start,
+        sections=profiling.snapshot(),
+        cached='parse' if parse_was_cached else '',
+        variant=variant)
+
+
+def solve_with_cprofile(solve: Callable[[Any], Any], parsed: Any, output_prefix: str) -> Any:
+    """Leaves <output_prefix>.prof for pstats/snakeviz and <output_prefix>.txt with the top functions."""
+    with profiling.cprofiled(f'{output_prefix}.prof') as profiler:
+        answer = solve(parsed)
+    Path(f'{output_prefix}.txt').write_text(profiling.format_cprofile(profiler))
+    return answer
+
+
+def run(
+        days: List[int], parts: List[int], input_template: str, jobs: int = 1,
+        cprofile_dir: Optional[str] = None, cache_options: Optional[CacheOptions] = None,
+        variant: str = '') -> List[PartResult]:
+    """Results come back in (day, module, part) order, however many jobs are used.
+    With a variant, only modules implementing that variant of a part run it."""
+    tasks = [
+        (day, module.__name__, part, input_template.format(day=f'{day:02}'), cprofile_dir, cache_options, variant)
+        for day in days
+        for module in discover_solvers(day)
+        for part in parts
+        if hasattr(module, solver_name(part, variant))]
+
+    if jobs == 1 or not tasks:
+        return [run_part(*task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=add_repo_root_to_path) as executor:
+        return list(executor.map(run_part, *zip(*tasks)))
+
+
+def add_repo_root_to_path() -> None:
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+
+
+def format_text(results: List[PartResult]) -> str:
+    header = f'{"module":<28} {"part":>4} {"parse_s":>10} {"solve_s":>10} {"cached":>6}  answer'
+    rows = [
+        f'{r.label:<28} {r.part:>4} {r.parse_seconds:>10.4f} {r.solve_seconds:>10.4f} {r.cached:>6}  {r.answer!r}'
+        for r in results]
+    return '\n'.join([header] + rows + format_sections(results))
+
+
+def format_sections(results: List[PartResult]) -> List[str]:
+    rows = []
+    for r in results:
+        for name, stats in r.sections.items():
+            rows.append(f'  {r.label}.part_{r.part} {name:<32} {stats["calls"]:>12} calls {stats["seconds"]:>10.4f} s')
+    return ['', 'profiled sections:'] + rows if rows else []
+
+
+def format_json(results: List[PartResult]) -> str:
+    return json.dumps([asdict(result) for result in results], indent=2)
+
+
+def get_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Run solvers and time their parts.')
+    parser.add_argument('--days', default='1-13', help="days to run, e.g. '1-13' or '1,3,5-7'")
+    parser.add_argument('--parts', default='1,2', help="parts to run, e.g. '1,2'")
+    parser.add_argument(
+        '--input', default=DEFAULT_INPUT,
+        help="input file; '{day}' is replaced with the zero padded day (default: %(default)s)")
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    parser.add_argument(
+        '--jobs', type=int, default=os.cpu_count() or 1,
+        help='worker processes to spread the parts over, 1 runs them in this process (default: %(default)s)')
+    parser.add_argument(
+        '--profile', action='store_true', help='turn on the utils.profiling hooks and report their sections')
+    parser.add_argument('--cprofile', metavar='DIR', help='run every part under cProfile, writing the stats to DIR')
+    parser.add_argument(
+        '--cache', nargs='?', const=str(DEFAULT_CACHE_DIR), metavar='DIR',
+        help=f'reuse parsed inputs stored in DIR (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-answers', action='store_true', help='also reuse answers, skipping the parts')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES >> 20)
+    parser.add_argument('--variant', default='', help="run part_N_<variant> instead of part_N, e.g. 'traced'")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = get_arg_parser().parse_args(argv)
+    add_repo_root_to_path()
+    if args.profile:
+        profiling.enable()
+    if args.cprofile:
+        Path(args.cprofile).mkdir(parents=True, exist_ok=True)
+
+    cache_options = None
+    if args.cache:
+        cache_options = CacheOptions(args.cache, args.cache_max_mb << 20, args.cache_answers)
+
+    results = run(
+        parse_int_ranges(args.days), parse_int_ranges(args.parts), args.input, args.jobs, args.cprofile,
+        cache_options, args.variant)
+    formatter = format_json if args.format == 'json' else format_text
+    print(formatter(results))
+
+
+if __name__ == '__main__':
+    main()